@@ -1,10 +1,11 @@
-from flask import Flask, render_template, render_template_string, jsonify, request, send_from_directory, send_file, session, redirect, url_for
+from flask import Flask, Response, render_template, render_template_string, jsonify, request, send_from_directory, send_file, session, redirect, url_for, stream_with_context, make_response
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_session import Session
 import atexit
 import contextlib
+from functools import lru_cache, wraps
 try:
     import fcntl as _fcntl
 except ImportError:
@@ -29,16 +30,19 @@ else:
 from typing import Optional
 import json
 import os
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timezone
 try:
     from zoneinfo import ZoneInfo
 except ImportError:  # pragma: no cover - Python < 3.9 fallback
     ZoneInfo = None  # type: ignore[assignment]
+import tempfile
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import time
-from io import BytesIO
 import logging
 from dotenv import load_dotenv
+from werkzeug.exceptions import NotFound
 from werkzeug.utils import secure_filename
 
 import hashlib
@@ -51,10 +55,19 @@ except ImportError:
 
 try:
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment
     from openpyxl.utils import get_column_letter
+    # Export sheets never exceed a few dozen columns; resolve letters once.
+    _COL_LETTERS = tuple(get_column_letter(i) for i in range(1, 33))
+    # Shared export header styles; openpyxl dedupes them to one style record.
+    _HEADER_FONT = Font(bold=True, color="FFFFFF")
+    _HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    _HEADER_ALIGNMENT = Alignment(horizontal="center")
 except ImportError:
     Workbook = None
+    _COL_LETTERS = ()
+    _HEADER_FONT = _HEADER_FILL = _HEADER_ALIGNMENT = None
 
 import simple_org_chart.config as app_config
 from simple_org_chart.config import EMPLOYEE_LIST_FILE
@@ -78,6 +91,7 @@ from simple_org_chart.settings import (
     parse_ignored_titles,
     save_settings,
     translate_placeholder,
+    update_settings,
 )
 from simple_org_chart.msgraph import (
     calculate_days_since,
@@ -118,17 +132,22 @@ from simple_org_chart.scheduler import (
     start_scheduler,
     stop_scheduler,
 )
-from simple_org_chart.utils.files import validate_image_file
+from simple_org_chart.utils.files import (
+    create_temp_file,
+    validate_image_file,
+    write_bytes_atomic,
+    write_json_atomic,
+)
 
 # Import from new split modules
 from simple_org_chart.hierarchy import (
     build_org_hierarchy,
-    collect_missing_manager_records,
     collect_employee_option_labels,
     collect_unique_field_values,
     flatten_hierarchy_to_employee_list,
     get_employee_list_for_metadata,
     load_cached_employees,
+    mark_new_employees,
 )
 from simple_org_chart.data_update import (
     collect_recently_disabled_employees,
@@ -139,7 +158,7 @@ from simple_org_chart.data_update import (
     update_employee_data,
     _load_fetch_all_employees_fallback,
 )
-from simple_org_chart.exports import format_hire_date, add_metadata_sheet, format_export_filters
+from simple_org_chart.exports import format_hire_date, add_metadata_sheet, format_export_filters, iter_org_chart_rows
 from simple_org_chart import user_scanner_service
 
 load_dotenv()
@@ -173,8 +192,8 @@ logger.info(f"Application port resolved to {APP_PORT}")
 # Environment-configurable settings
 SESSION_TYPE = os.environ.get('SESSION_TYPE', 'filesystem')
 MAX_FILE_SIZE = int(os.environ.get('MAX_FILE_SIZE_MB', '5')) * 1024 * 1024
-ALLOWED_EXTENSIONS = set(ext.strip().lower() for ext in os.environ.get('ALLOWED_LOGO_EXTENSIONS', 'png,jpg,jpeg').split(',') if ext.strip())
-FAVICON_ALLOWED_EXTENSIONS = set(ext.strip().lower() for ext in os.environ.get('ALLOWED_FAVICON_EXTENSIONS', 'ico,png,jpg,jpeg').split(',') if ext.strip())
+ALLOWED_EXTENSIONS = frozenset(ext.strip().lower() for ext in os.environ.get('ALLOWED_LOGO_EXTENSIONS', 'png,jpg,jpeg').split(',') if ext.strip())
+FAVICON_ALLOWED_EXTENSIONS = frozenset(ext.strip().lower() for ext in os.environ.get('ALLOWED_FAVICON_EXTENSIONS', 'ico,png,jpg,jpeg').split(',') if ext.strip())
 PHOTO_CACHE_SECONDS = int(os.environ.get('PHOTO_CACHE_SECONDS', '3600'))
 PHOTO_CACHE_FILE_SECONDS = int(os.environ.get('PHOTO_CACHE_FILE_SECONDS', '86400'))
 RATE_LIMIT_DEFAULT = os.environ.get('RATE_LIMIT_DEFAULT', '200 per day,50 per hour')
@@ -224,6 +243,168 @@ def _get_known_employee_ids() -> Optional[set[str]]:
         _known_employee_ids_mtime = mtime
     return _known_employee_ids_cache
 
+# In-memory cache of the parsed hierarchy in DATA_FILE, keyed on its mtime.
+# Callers may stamp derived flags (isNewEmployee) in place but must not
+# otherwise mutate the cached tree.
+_employee_data_cache: Optional[dict] = None
+_employee_data_mtime: Optional[int] = None
+# (mtime, local date ordinal, months threshold) the cached tree was last stamped for.
+_employee_data_stamp: Optional[tuple] = None
+
+
+def _load_employee_data() -> Optional[dict]:
+    """Return the parsed hierarchy, re-reading DATA_FILE only when it changes."""
+    global _employee_data_cache, _employee_data_mtime, _employee_data_stamp
+    try:
+        mtime = os.stat(DATA_FILE).st_mtime_ns
+    except OSError:
+        return None
+    if _employee_data_cache is None or mtime != _employee_data_mtime:
+        with open(DATA_FILE, 'rb') as f:
+            _employee_data_cache = json.loads(f.read())
+        _employee_data_mtime = mtime
+        _employee_data_stamp = None
+    return _employee_data_cache
+
+
+# (tree, flattened nodes, lowercased (name, title, department) per node) for
+# search, lookup and count endpoints; rebuilt only when _load_employee_data
+# returns a new tree.
+_hierarchy_index: Optional[tuple] = None
+
+
+def _get_hierarchy_index(data):
+    """Return the pre-order node list of *data* and its lowercased search fields."""
+    global _hierarchy_index
+    cached = _hierarchy_index
+    if cached is not None and cached[0] is data:
+        return cached[1], cached[2]
+
+    nodes = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if not node or not isinstance(node, dict):
+            continue
+        nodes.append(node)
+        children = node.get('children')
+        if children and isinstance(children, list):
+            stack.extend(reversed(children))
+
+    lowered_fields = [
+        (
+            (node.get('name') or '').lower(),
+            (node.get('title') or '').lower(),
+            (node.get('department') or '').lower(),
+        )
+        for node in nodes
+    ]
+    _hierarchy_index = (data, nodes, lowered_fields)
+    return nodes, lowered_fields
+
+
+# (tree, {employee id: node}) for /api/employee lookups.
+_employee_id_index: Optional[tuple] = None
+
+
+def _find_employee_node(data, employee_id):
+    """Return the first node in pre-order whose id is *employee_id*, or None."""
+    global _employee_id_index
+    cached = _employee_id_index
+    if cached is not None and cached[0] is data:
+        return cached[1].get(employee_id)
+
+    nodes, _ = _get_hierarchy_index(data)
+    by_id = {}
+    for node in nodes:
+        node_id = node.get('id')
+        if node_id is not None:
+            by_id.setdefault(node_id, node)
+    _employee_id_index = (data, by_id)
+    return by_id.get(employee_id)
+
+
+# (tree, {trigram: set of node indexes}) over the lowercased search fields of
+# _get_hierarchy_index, built on the first 3+ character search of each tree.
+_search_trigrams: Optional[tuple] = None
+
+
+def _search_candidate_indexes(data, lowered_fields, query):
+    """Return pre-order indexes of nodes that may contain *query*, or None to scan all."""
+    global _search_trigrams
+    if len(query) < 3:
+        return None
+
+    cached = _search_trigrams
+    if cached is not None and cached[0] is data:
+        postings = cached[1]
+    else:
+        postings = {}
+        for index, fields in enumerate(lowered_fields):
+            for text in fields:
+                for start in range(len(text) - 2):
+                    postings.setdefault(text[start:start + 3], set()).add(index)
+        _search_trigrams = (data, postings)
+
+    # Any node containing the query holds every one of its trigrams.
+    candidates = None
+    for start in range(len(query) - 2):
+        posting = postings.get(query[start:start + 3])
+        if not posting:
+            return []
+        candidates = set(posting) if candidates is None else candidates & posting
+        if not candidates:
+            return []
+    return sorted(candidates)
+
+
+# Single worker so background cache writes land in submission order.
+_persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='persist')
+# Held while a manual refresh runs in this process, so repeated clicks are
+# rejected instead of queueing a second full Graph refresh.
+_manual_update_lock = threading.Lock()
+
+
+def _start_manual_update():
+    """Run update_employee_data on a daemon thread; False if one is already running."""
+    if not _manual_update_lock.acquire(blocking=False):
+        return False
+
+    def run():
+        try:
+            update_employee_data(source='manual')
+        finally:
+            _manual_update_lock.release()
+
+    try:
+        threading.Thread(target=run, daemon=True).start()
+    except Exception:
+        _manual_update_lock.release()
+        raise
+    return True
+
+
+def _persist_enforced_hierarchy(data, missing_records):
+    """Atomically rewrite the hierarchy and missing-manager caches (runs on _persist_executor)."""
+    try:
+        write_json_atomic(DATA_FILE, data)
+        write_json_atomic(MISSING_MANAGER_FILE, missing_records)
+        logger.info("Refreshed global hierarchy cache to align with environment top user")
+    except Exception as cache_error:
+        logger.error(f"Failed to persist environment-aligned hierarchy: {cache_error}")
+
+
+def _stamp_new_employees(data, months_threshold):
+    """Stamp isNewEmployee, skipping the walk when the cached tree is already current."""
+    global _employee_data_stamp
+    if data is not _employee_data_cache:
+        mark_new_employees(data, months_threshold)
+        return
+    stamp = (_employee_data_mtime, datetime.now().toordinal(), months_threshold)
+    if stamp != _employee_data_stamp:
+        mark_new_employees(data, months_threshold)
+        _employee_data_stamp = stamp
+
 # Security headers (configurable via .env)
 SECURITY_HEADER_CONTENT_TYPE_OPTIONS = os.environ.get('SECURITY_HEADER_CONTENT_TYPE_OPTIONS', 'nosniff')
 SECURITY_HEADER_FRAME_OPTIONS = os.environ.get('SECURITY_HEADER_FRAME_OPTIONS', 'DENY')
@@ -237,12 +418,88 @@ app = Flask(
     template_folder=str(app_config.TEMPLATE_DIR),
 )
 
+# Large hierarchy and report payloads are serialized on every hit; skip the
+# per-dict key sort the default JSON provider performs before encoding, and
+# emit non-ASCII names as UTF-8 rather than six-byte \uXXXX escapes.
+app.json.sort_keys = False
+app.json.ensure_ascii = False
+
 _allowed_origins = [origin.strip() for origin in os.environ.get('CORS_ALLOWED_ORIGINS', '').split(',') if origin.strip()]
 if _allowed_origins:
     CORS(app, resources={r"/api/*": {"origins": _allowed_origins}})
 
+
+# Generated keys are 64 hex characters; anything shorter on disk is an empty
+# or truncated file left by a writer that died before finishing.
+_SECRET_KEY_MIN_LENGTH = 32
+
+
+def _read_secret_key_file(key_path):
+    """Return the stripped key file contents, or None when it cannot be read."""
+    try:
+        with open(key_path, 'r', encoding='utf-8') as key_file:
+            return key_file.read().strip()
+    except OSError as error:
+        logger.warning("Failed to read persisted secret key: %s", error)
+        return None
+
+
+def _replace_secret_key_file(key_path):
+    """Atomically overwrite an empty or truncated key file; return the key on disk."""
+    logger.warning("Secret key file %s is empty or truncated; generating a new key", key_path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix='.secret_key.', dir=os.path.dirname(key_path))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as key_file:
+                key_file.write(secrets.token_hex(32))
+            os.replace(tmp_path, key_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+    except OSError as error:
+        logger.warning("Failed to replace persisted secret key: %s", error)
+        return None
+    # Re-read so workers repairing the file at the same time settle on one key.
+    key = _read_secret_key_file(key_path)
+    return key if key and len(key) >= _SECRET_KEY_MIN_LENGTH else None
+
+
+def _load_or_create_secret_key():
+    """Return a session key persisted under DATA_DIR so workers and restarts share it."""
+    key_path = str(app_config.SECRET_KEY_FILE)
+    try:
+        os.makedirs(os.path.dirname(key_path), exist_ok=True)
+        fd = os.open(key_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    except FileExistsError:
+        # Another worker may have created the file but not written it yet;
+        # if it stays short, treat it as missing and write a new key.
+        for _ in range(50):
+            key = _read_secret_key_file(key_path)
+            if key is None:
+                break
+            if len(key) >= _SECRET_KEY_MIN_LENGTH:
+                return key
+            time.sleep(0.01)
+        else:
+            key = _replace_secret_key_file(key_path)
+            if key:
+                return key
+    except OSError as error:
+        logger.warning("Failed to persist generated secret key: %s", error)
+    else:
+        key = secrets.token_hex(32)
+        with os.fdopen(fd, 'w', encoding='utf-8') as key_file:
+            key_file.write(key)
+        logger.info("Generated a new secret key at %s", key_path)
+        return key
+
+    logger.warning("Using an ephemeral secret key; sessions will not survive restarts")
+    return secrets.token_hex(32)
+
+
 # Security Configuration
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', secrets.token_hex(32))
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or _load_or_create_secret_key()
 app.config['SESSION_TYPE'] = SESSION_TYPE
 app.config['SESSION_PERMANENT'] = False
 
@@ -273,15 +530,21 @@ if not ADMIN_PASSWORD:
 if ADMIN_PASSWORD in {'admin123', 'your-admin-password-here'}:
     raise RuntimeError('ADMIN_PASSWORD must not use the default placeholder value')
 
-# Security headers
+# Security headers, built once and applied to every response
+_SECURITY_HEADERS = (
+    ('X-Content-Type-Options', SECURITY_HEADER_CONTENT_TYPE_OPTIONS),
+    ('X-Frame-Options', SECURITY_HEADER_FRAME_OPTIONS),
+    ('X-XSS-Protection', SECURITY_HEADER_XSS_PROTECTION),
+    ('Strict-Transport-Security', SECURITY_HEADER_HSTS),
+    ('Content-Security-Policy', SECURITY_HEADER_CSP),
+)
+
+
 @app.after_request
 def add_security_headers(response):
-    response.headers['X-Content-Type-Options'] = SECURITY_HEADER_CONTENT_TYPE_OPTIONS
-    response.headers['X-Frame-Options'] = SECURITY_HEADER_FRAME_OPTIONS
-    response.headers['X-XSS-Protection'] = SECURITY_HEADER_XSS_PROTECTION
-    response.headers['Strict-Transport-Security'] = SECURITY_HEADER_HSTS
-    response.headers['Content-Security-Policy'] = SECURITY_HEADER_CSP
+    response.headers.update(_SECURITY_HEADERS)
     return response
+
 app_config.ensure_directories()
 
 DATA_DIR = str(app_config.DATA_DIR)
@@ -301,6 +564,8 @@ GRAPH_CAPABILITIES_FILE = str(app_config.GRAPH_CAPABILITIES_FILE)
 DIRTY_DATA_FILE = str(app_config.DIRTY_DATA_FILE)
 MISSING_HIRE_DATE_FILE = str(app_config.MISSING_HIRE_DATE_FILE)
 DATA_UPDATE_STATUS_FILE = os.path.join(DATA_DIR, 'data_update_status.json')
+# Resolved once; ensure_directories() above creates it.
+PHOTOS_DIR = os.path.realpath(str(app_config.PHOTOS_DIR))
 
 # Always delete the capabilities file on startup — it is regenerated on the
 # next sync via JWT-decode.  This ensures no stale data from previous probe
@@ -325,8 +590,18 @@ if not all([TENANT_ID, CLIENT_ID, CLIENT_SECRET]):
     logger.warning("AZURE_CLIENT_SECRET: " + ("Set" if CLIENT_SECRET else "Not set"))
     logger.warning("Please check your .env file exists and contains the correct values")
 
+def _file_extension(filename):
+    """Return the lower-cased text after the last dot of ``filename``, or ''.
+
+    Unlike os.path.splitext, a bare ``.png`` counts as a png extension.
+    """
+    _, dot, ext = filename.rpartition('.')
+    return ext.lower() if dot else ''
+
+
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    ext = _file_extension(filename)
+    return bool(ext) and ext in ALLOWED_EXTENSIONS
 
 
 configure_scheduler(update_employee_data)
@@ -354,29 +629,55 @@ elif hasattr(app, 'before_request'):
 
 atexit.register(stop_scheduler)
 
+# Template sources keyed by name -> (path, mtime, content), refreshed when the file changes.
+_template_cache: dict[str, tuple[str, float, str]] = {}
+
+
 def get_template(template_name):
     """Load HTML template from file"""
-    possible_paths = [
-        f'templates/{template_name}',
-        template_name,
-        os.path.join(os.path.dirname(__file__), 'templates', template_name),
-        os.path.join(os.path.dirname(__file__), template_name),
-        os.path.join(str(app_config.TEMPLATE_DIR), template_name)
-    ]
-    
+    cached = _template_cache.get(template_name)
+    if cached:
+        path, mtime, content = cached
+        # Once resolved, a template is re-read from the same path when it
+        # changes instead of probing every candidate location again.
+        possible_paths = [path]
+        try:
+            if os.path.getmtime(path) == mtime:
+                return content
+        except OSError:
+            _template_cache.pop(template_name, None)
+            possible_paths = None
+    else:
+        possible_paths = None
+
+    if possible_paths is None:
+        possible_paths = [
+            f'templates/{template_name}',
+            template_name,
+            os.path.join(os.path.dirname(__file__), 'templates', template_name),
+            os.path.join(os.path.dirname(__file__), template_name),
+            os.path.join(str(app_config.TEMPLATE_DIR), template_name)
+        ]
+
     for path in possible_paths:
-        if os.path.exists(path):
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    # Only log template loading in debug mode to reduce log spam
-                    logger.debug(f"Loading template from: {path}")
-                    return f.read()
-            except Exception as e:
-                logger.error(f"Error reading {path}: {e}")
-    
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                # Only log template loading in debug mode to reduce log spam
+                logger.debug(f"Loading template from: {path}")
+                content = f.read()
+            _template_cache[template_name] = (path, mtime, content)
+            return content
+        except Exception as e:
+            logger.error(f"Error reading {path}: {e}")
+
     logger.error(f"{template_name} not found in any expected location")
     return f"<h1>Error: {template_name} not found</h1>"
 
+
 # Authentication routes
 @app.route('/login', methods=['GET', 'POST'])
 @limiter.limit(RATE_LIMIT_LOGIN)
@@ -431,15 +732,10 @@ def logout():
 
 @app.route('/')
 def index():
-    template_content = get_template('index.html')
     settings = load_settings()
     favicon_path = settings.get('faviconPath', '/favicon.ico')
-    
-    # Inject favicon link into template
-    favicon_link = f'<link rel="icon" type="image/x-icon" href="{favicon_path}">'
-    template_content = template_content.replace('</head>', f'    {favicon_link}\n</head>')
-    
-    return render_template_string(template_content)
+
+    return render_template('index.html', favicon_path=favicon_path)
 
 @app.route('/configure')
 def configure():
@@ -449,20 +745,16 @@ def configure():
         params = {'next': desired_path} if desired_path else {}
         return redirect(url_for('login', **params))
     
-    template_content = get_template('configure.html')
     settings = load_settings()
     favicon_path = settings.get('faviconPath', '/favicon.ico')
     logo_path = settings.get('logoPath', '/static/icon.png')
     chart_title = (settings.get('chartTitle') or '').strip() or 'Simple Org Chart'
-    
-    # Inject favicon link into template
-    favicon_link = f'<link rel="icon" type="image/x-icon" href="{favicon_path}">'
-    template_content = template_content.replace('</head>', f'    {favicon_link}\n</head>')
-    
-    return render_template_string(
-        template_content,
+
+    return render_template(
+        'configure.html',
         chart_title=chart_title,
         logo_path=logo_path,
+        favicon_path=favicon_path,
         favicon_image_path=favicon_path,
         _=translate_placeholder
     )
@@ -471,58 +763,51 @@ def configure():
 @app.route('/reports')
 @login_required
 def reports():
-    template_content = get_template('reports.html')
     settings = load_settings()
     favicon_path = settings.get('faviconPath', '/favicon.ico')
 
-    favicon_link = f'<link rel="icon" type="image/x-icon" href="{favicon_path}">'
-    template_content = template_content.replace('</head>', f'    {favicon_link}\n</head>')
+    return render_template('reports.html', favicon_path=favicon_path)
+
+# Uploaded logo/favicon names embed a short lowercase hex digest (blake2b; md5 before).
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+
+def _is_upload_hash(file_hash, length):
+    """Return True when ``file_hash`` is a ``length``-character lowercase hex digest."""
+    return len(file_hash) == length and _HEX_DIGITS.issuperset(file_hash)
 
-    return render_template_string(template_content)
 
 @app.route('/static/icon_custom_<string:file_hash>.png')
 def serve_custom_logo(file_hash):
     """Serve custom logo files from the data directory"""
     # Validate file_hash to prevent directory traversal
-    if not file_hash.isalnum() or len(file_hash) != 8:
+    if not _is_upload_hash(file_hash, 8):
         return "Invalid logo identifier", 400
-    
-    data_dir_real = os.path.realpath(DATA_DIR)
-    custom_logo = os.path.realpath(os.path.join(DATA_DIR, f'icon_custom_{file_hash}.png'))
-    if not custom_logo.startswith(data_dir_real + os.sep):
-        return "Invalid logo path", 400
-    
-    if os.path.exists(custom_logo) and os.path.isfile(custom_logo):
-        return send_file(custom_logo, 
-                       mimetype='image/png',
-                       as_attachment=False,
-                       max_age=PHOTO_CACHE_SECONDS)
-    else:
+
+    try:
+        return send_from_directory(DATA_DIR, f'icon_custom_{file_hash}.png',
+                                   mimetype='image/png',
+                                   max_age=PHOTO_CACHE_SECONDS)
+    except NotFound:
         return "Logo not found", 404
 
 @app.route('/static/favicon_custom_<file_hash>.<ext>')
 def serve_custom_favicon(file_hash, ext):
     """Serve custom favicon files from the data directory"""
     # Validate file_hash to prevent directory traversal
-    if not file_hash.isalnum() or len(file_hash) != 12:
+    if not _is_upload_hash(file_hash, 12):
         return "Invalid favicon identifier", 400
-    
+
     # Validate extension
-    if ext not in ['ico', 'png']:
+    if ext not in ('ico', 'png'):
         return "Invalid favicon format", 400
-    
-    data_dir_real = os.path.realpath(DATA_DIR)
-    custom_favicon = os.path.realpath(os.path.join(DATA_DIR, f'favicon_custom_{file_hash}.{ext}'))
-    if not custom_favicon.startswith(data_dir_real + os.sep):
-        return "Invalid favicon path", 400
-    
-    if os.path.exists(custom_favicon) and os.path.isfile(custom_favicon):
-        mimetype = 'image/x-icon' if ext == 'ico' else 'image/png'
-        return send_file(custom_favicon, 
-                       mimetype=mimetype,
-                       as_attachment=False,
-                       max_age=PHOTO_CACHE_SECONDS)
-    else:
+
+    mimetype = 'image/x-icon' if ext == 'ico' else 'image/png'
+    try:
+        return send_from_directory(DATA_DIR, f'favicon_custom_{file_hash}.{ext}',
+                                   mimetype=mimetype,
+                                   max_age=PHOTO_CACHE_SECONDS)
+    except NotFound:
         return "Favicon not found", 404
 
 @app.route('/static/<path:filename>')
@@ -545,59 +830,203 @@ def get_employee_photo(user_id):
             logger.warning(f"Invalid user_id for photo request: {user_id!r}")
             return "Invalid user identifier", 400
 
-        # Create photos cache directory
-        photos_dir = os.path.join(DATA_DIR, 'photos')
-        if not os.path.exists(photos_dir):
-            os.makedirs(photos_dir, exist_ok=True)
-        
         # Build a safe filename from user_id: replace any non-alnum/dash/underscore
         safe_name = "".join(ch if (ch.isalnum() or ch in '-_') else '_' for ch in user_id)
+        photo_name = f"{safe_name}.jpg"
         # Normalize and ensure the path remains within the photos directory
-        photos_dir_real = os.path.realpath(photos_dir)
-        photo_file = os.path.realpath(os.path.join(photos_dir_real, f"{safe_name}.jpg"))
-        if not photo_file.startswith(photos_dir_real + os.sep):
+        photo_file = os.path.realpath(os.path.join(PHOTOS_DIR, photo_name))
+        if not photo_file.startswith(PHOTOS_DIR + os.sep):
             logger.warning(f"Attempted path traversal in photo request: {user_id!r}")
             return "Invalid photo path", 400
-        
-        if os.path.exists(photo_file):
-            # Check if cache is still valid
-            if time.time() - os.path.getmtime(photo_file) < PHOTO_CACHE_FILE_SECONDS:
-                response = send_from_directory(
-                    photos_dir_real, f"{safe_name}.jpg", mimetype='image/jpeg'
-                )
-                # Add cache headers to prevent browser caching issues
-                response.headers['Cache-Control'] = f'public, max-age={PHOTO_CACHE_SECONDS}'
-                response.headers['Last-Modified'] = datetime.fromtimestamp(os.path.getmtime(photo_file)).strftime('%a, %d %b %Y %H:%M:%S GMT')
-                return response
-        
-        # Fetch fresh photo from Graph API
-        token = get_access_token()
-        if token:
-            photo_data = fetch_employee_photo(user_id, token)
-            if photo_data:
-                # Save photo to local cache (binary image, not sensitive PII)
-                with open(photo_file, 'wb') as f:  # lgtm[py/clear-text-storage-sensitive-data]
-                    f.write(photo_data)
-                
-                # Serve the photo (data fetched from MS Graph, not a user-controlled path)
-                response = send_file(  # nosec - photo_data is from Graph API, not filesystem
-                    BytesIO(photo_data),
-                    mimetype='image/jpeg',
-                    download_name='photo.jpg',
-                    as_attachment=False
-                )
-                response.headers['Cache-Control'] = f'public, max-age={PHOTO_CACHE_SECONDS}'
-                return response
-        
-        # Fallback to default user icon
-        logger.debug(f"No photo available for user {user_id}, using fallback")
-        return send_from_directory(app.static_folder, 'usericon.png')
-        
+
+        try:
+            photo_age = time.time() - os.path.getmtime(photo_file)
+        except OSError:
+            photo_age = None
+
+        if photo_age is None or photo_age >= PHOTO_CACHE_FILE_SECONDS:
+            # Fetch fresh photo from Graph API
+            token = get_access_token()
+            photo_data = fetch_employee_photo(user_id, token) if token else None
+            if not photo_data:
+                # Fallback to default user icon
+                logger.debug(f"No photo available for user {user_id}, using fallback")
+                return send_from_directory(app.static_folder, 'usericon.png')
+
+            # Save photo to local cache (binary image, not sensitive PII); the
+            # temp-file + replace means a half-written photo is never served.
+            write_bytes_atomic(photo_file, photo_data)  # lgtm[py/clear-text-storage-sensitive-data]
+
+        # Conditional response: repeat clients get a 304 via ETag/Last-Modified
+        return send_from_directory(
+            PHOTOS_DIR,
+            photo_name,
+            mimetype='image/jpeg',
+            conditional=True,
+            max_age=PHOTO_CACHE_SECONDS,
+        )
+
     except Exception as e:
         logger.error(f"Error serving photo for user {user_id}: {e}")
         return send_from_directory(app.static_folder, 'usericon.png')
 
+# Recent 200 bodies of _cache_file_etag views that opt in with remember=True,
+# keyed on (path, tag), so clients polling the same report filters skip
+# re-filtering and re-serialising. Entries are (expires_at, body, mimetype,
+# vary); they expire after a short TTL and their bodies share a byte budget,
+# so large reports cannot pin much memory in each worker.
+_etag_response_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_etag_response_cache_lock = threading.Lock()
+_etag_response_cache_bytes = 0
+_ETAG_RESPONSE_CACHE_SIZE = 32
+_ETAG_RESPONSE_CACHE_TTL_SECONDS = 30
+_ETAG_RESPONSE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_ETAG_RESPONSE_MAX_BODY_BYTES = 4 * 1024 * 1024
+
+
+def _cache_file_etag(*source_files, vary=None, remember=False):
+    """Answer GETs with 304 while their cache files and query are unchanged.
+
+    The tag covers the mtimes of ``source_files`` (the first one must exist),
+    the query string, the current date (reports filter on rolling day windows
+    and new-hire flags age out) and, when given, the value returned by
+    ``vary()`` for per-session inputs. ``refresh=true`` requests always run
+    the view. With ``remember=True`` the response body is also kept
+    server-side for a short while, so a request without a matching
+    ``If-None-Match`` skips the view while the tag is unchanged.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = None
+            if not _parse_bool_arg(request.args.get('refresh'), default=False):
+                etag = _compute_cache_file_etag(source_files, vary() if vary else '')
+                if etag and etag in request.if_none_match:
+                    response = Response(status=304)
+                    response.set_etag(etag)
+                    return response
+
+            cache_key = (request.path, etag)
+            response = None
+            if etag and remember:
+                response = _replay_etag_response(cache_key)
+            replayed = response is not None
+            if not replayed:
+                response = make_response(view(*args, **kwargs))
+            if etag and response.status_code == 200:
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'private, no-cache'
+                if remember and not replayed:
+                    _remember_etag_response(cache_key, response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _replay_etag_response(cache_key):
+    with _etag_response_cache_lock:
+        entry = _etag_response_cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            _drop_etag_response(cache_key)
+            return None
+        _etag_response_cache.move_to_end(cache_key)
+    _, body, mimetype, vary = entry
+    response = Response(body, mimetype=mimetype)
+    response.vary.update(vary)
+    return response
+
+
+def _remember_etag_response(cache_key, response):
+    mimetype = response.mimetype
+    vary = tuple(response.vary)
+    if not response.is_streamed:
+        _store_etag_response(cache_key, response.get_data(), mimetype, vary)
+        return
+
+    # Streamed reports are recorded as they are sent; only complete bodies
+    # within the size limit are kept.
+    body = response.response
+
+    def record():
+        chunks = []
+        size = 0
+        try:
+            for chunk in body:
+                if chunks is not None:
+                    data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                    size += len(data)
+                    if size > _ETAG_RESPONSE_MAX_BODY_BYTES:
+                        chunks = None
+                    else:
+                        chunks.append(data)
+                yield chunk
+        finally:
+            close = getattr(body, 'close', None)
+            if close is not None:
+                close()
+        if chunks is not None:
+            _store_etag_response(cache_key, b''.join(chunks), mimetype, vary)
+
+    response.response = record()
+
+
+def _store_etag_response(cache_key, body, mimetype, vary):
+    global _etag_response_cache_bytes
+    if len(body) > _ETAG_RESPONSE_MAX_BODY_BYTES:
+        return
+    now = time.monotonic()
+    with _etag_response_cache_lock:
+        _drop_etag_response(cache_key)
+        for key in [key for key, entry in _etag_response_cache.items() if entry[0] <= now]:
+            _drop_etag_response(key)
+        _etag_response_cache[cache_key] = (
+            now + _ETAG_RESPONSE_CACHE_TTL_SECONDS, body, mimetype, vary,
+        )
+        _etag_response_cache_bytes += len(body)
+        while (
+            len(_etag_response_cache) > _ETAG_RESPONSE_CACHE_SIZE
+            or _etag_response_cache_bytes > _ETAG_RESPONSE_CACHE_MAX_BYTES
+        ):
+            _drop_etag_response(next(iter(_etag_response_cache)))
+
+
+def _drop_etag_response(cache_key):
+    """Remove one entry; the caller holds _etag_response_cache_lock."""
+    global _etag_response_cache_bytes
+    entry = _etag_response_cache.pop(cache_key, None)
+    if entry is not None:
+        _etag_response_cache_bytes -= len(entry[1])
+
+
+def _compute_cache_file_etag(source_files, extra):
+    mtimes = []
+    for index, path in enumerate(source_files):
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            if index == 0:
+                return None
+            mtimes.append(0)
+    query = sorted(request.args.items(multi=True))
+    # NDJSON and JSON bodies of a report must not share a tag.
+    body_format = 'ndjson' if _wants_ndjson() else ''
+    fingerprint = f"{mtimes}|{query}|{datetime.now().date().isoformat()}|{extra}|{body_format}"
+    return hashlib.blake2b(fingerprint.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _session_top_user_key():
+    """Per-session input to the org chart: the top-user override, if any."""
+    if 'topUserEmail' not in session:
+        return ''
+    return f"override:{session.get('topUserEmail') or ''}"
+
+
 @app.route('/api/employees')
+@_cache_file_etag(DATA_FILE, EMPLOYEE_LIST_FILE, SETTINGS_FILE, vary=_session_top_user_key)
 def get_employees():
     try:
         logger.info("API request for /api/employees received")
@@ -610,8 +1039,7 @@ def get_employees():
             logger.error(f"Could not create data file {DATA_FILE}")
             return jsonify({'error': 'No employee data available. Please check configuration.'}), 500
         
-        with open(DATA_FILE, 'r') as f:
-            data = json.load(f)
+        data = _load_employee_data()
 
         settings = load_settings()
         months_threshold = settings.get('newEmployeeMonths', 3)
@@ -622,6 +1050,7 @@ def get_employees():
 
         requested_top_user = None
         override_reason = None
+        pending_missing_records = None
 
         if session_override_present:
             requested_top_user = session_top_user
@@ -644,60 +1073,43 @@ def get_employees():
                 if employees:
                     try:
                         with open(EMPLOYEE_LIST_FILE, 'w') as cache_file:
-                            json.dump(employees, cache_file, indent=2)
+                            cache_file.write(json.dumps(employees))
                     except Exception as cache_error:
                         logger.error(f"Failed to refresh employee cache: {cache_error}")
 
             if employees:
-                override_hierarchy = build_org_hierarchy(
-                    employees,
-                    top_user_email_override=requested_top_user,
-                    settings=settings
-                )
+                enforce_default = override_reason == 'settings default enforcement'
+                if enforce_default:
+                    # The persisted missing-manager report is derived in the same build.
+                    override_hierarchy, missing_records = build_org_hierarchy(
+                        employees,
+                        top_user_email_override=requested_top_user,
+                        settings=settings,
+                        return_missing=True,
+                    )
+                else:
+                    override_hierarchy = build_org_hierarchy(
+                        employees,
+                        top_user_email_override=requested_top_user,
+                        settings=settings
+                    )
                 if override_hierarchy:
                     data = override_hierarchy
 
-                    if override_reason == 'settings default enforcement':
-                        try:
-                            with open(DATA_FILE, 'w') as data_file:
-                                json.dump(data, data_file, indent=2)
-                            missing_records = collect_missing_manager_records(
-                                employees,
-                                data,
-                                settings,
-                                top_user_email_override=requested_top_user
-                            )
-                            with open(MISSING_MANAGER_FILE, 'w') as report_file:
-                                json.dump(missing_records, report_file, indent=2)
-                            logger.info("Refreshed global hierarchy cache to align with environment top user")
-                        except Exception as cache_error:
-                            logger.error(f"Failed to persist environment-aligned hierarchy: {cache_error}")
+                    if enforce_default:
+                        pending_missing_records = missing_records
                 else:
                     logger.warning("Failed to build hierarchy with requested top user override; returning cached hierarchy")
             else:
                 logger.warning("Unable to locate employee data while applying top user override; returning cached hierarchy")
         
         if data:
-            def update_new_status(node):
-                if node.get('hireDate'):
-                    try:
-                        hire_date = datetime.fromisoformat(node['hireDate'])
-                        if hire_date.tzinfo:
-                            cutoff_date = datetime.now(hire_date.tzinfo) - timedelta(days=months_threshold * 30)
-                        else:
-                            cutoff_date = datetime.now() - timedelta(days=months_threshold * 30)
-                        node['isNewEmployee'] = hire_date > cutoff_date
-                    except:
-                        node['isNewEmployee'] = False
-                else:
-                    node['isNewEmployee'] = False
-                
-                if node.get('children'):
-                    for child in node['children']:
-                        update_new_status(child)
-            
-            update_new_status(data)
-        
+            _stamp_new_employees(data, months_threshold)
+
+        if pending_missing_records is not None:
+            # Submitted after stamping: from here on the tree is only read.
+            _persist_executor.submit(_persist_enforced_hierarchy, data, pending_missing_records)
+
         # Debug logging for root user (avoid logging sensitive identifiers)
         if data:
             logger.info(
@@ -805,6 +1217,12 @@ def get_presence():
         return jsonify({'error': 'Failed to fetch presence'}), 500
 
 
+@lru_cache(maxsize=1)
+def _mtime_isoformat(mtime_ns):
+    """UTC ISO timestamp for a file mtime; only the latest value is kept."""
+    return datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc).isoformat()
+
+
 @app.route('/api/settings', methods=['GET', 'POST'])
 def handle_settings():
     if request.method == 'GET':
@@ -814,9 +1232,9 @@ def handle_settings():
             settings['topUserEmail'] = session.get('topUserEmail') or ''
         data_last_updated = None
         try:
-            if os.path.exists(DATA_FILE):
-                modified_at = datetime.fromtimestamp(os.path.getmtime(DATA_FILE), tz=timezone.utc)
-                data_last_updated = modified_at.isoformat()
+            data_last_updated = _mtime_isoformat(os.stat(DATA_FILE).st_mtime_ns)
+        except FileNotFoundError:
+            pass
         except Exception as timestamp_error:
             logger.warning("Failed to compute data last updated timestamp: %s", timestamp_error)
 
@@ -849,9 +1267,30 @@ def handle_settings():
             return jsonify({'error': 'Internal server error'}), 500
 
 
+# Last computed metadata options, keyed on the mtimes of their source files.
+_metadata_options_cache: Optional[dict] = None
+_metadata_options_key: Optional[tuple] = None
+
+
+def _metadata_source_key():
+    key = []
+    for path in (EMPLOYEE_LIST_FILE, DATA_FILE):
+        try:
+            key.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
+
+
 @app.route('/api/metadata/options')
 @require_auth
+@_cache_file_etag(EMPLOYEE_LIST_FILE, DATA_FILE)
 def get_metadata_options():
+    global _metadata_options_cache, _metadata_options_key
+    source_key = _metadata_source_key()
+    if _metadata_options_cache is not None and source_key == _metadata_options_key:
+        return jsonify(_metadata_options_cache)
+
     employees = get_employee_list_for_metadata()
     job_titles = collect_unique_field_values(employees, 'title')
     departments = collect_unique_field_values(employees, 'department')
@@ -859,13 +1298,17 @@ def get_metadata_options():
     states = collect_unique_field_values(employees, 'state')
     employee_options = collect_employee_option_labels(employees)
 
-    return jsonify({
+    options = {
         'jobTitles': job_titles,
         'departments': departments,
         'countries': countries,
         'states': states,
         'employees': employee_options
-    })
+    }
+    if any(mtime is not None for mtime in source_key):
+        _metadata_options_cache = options
+        _metadata_options_key = source_key
+    return jsonify(options)
 
 
 @app.route('/api/graph-capabilities')
@@ -921,10 +1364,7 @@ def set_multiline_enabled():
         if 'multiLineChildrenEnabled' not in data:
             return jsonify({'error': 'Missing multiLineChildrenEnabled parameter'}), 400
 
-        current_settings = load_settings()
-        current_settings['multiLineChildrenEnabled'] = bool(data['multiLineChildrenEnabled'])
-
-        if save_settings(current_settings):
+        if update_settings({'multiLineChildrenEnabled': bool(data['multiLineChildrenEnabled'])}):
             return jsonify({'success': True})
         else:
             return jsonify({'error': 'Failed to save settings'}), 500
@@ -948,18 +1388,17 @@ def test_hierarchy(email):
         if not employees:
             return jsonify({'error': 'No employees found'}), 404
             
-        # Find the user with this email
-        target_user = None
-        for emp in employees:
-            if emp.get('email') == email:
-                target_user = emp
-                break
+        # Index by email once (first occurrence wins) and share it with the build
+        by_email = {emp['email']: emp for emp in reversed(employees) if emp.get('email')}
+        target_user = by_email.get(email)
                 
         if not target_user:
             return jsonify({'error': f'User with email {email} not found'}), 404
             
         # Build hierarchy with specified top-level user
-        hierarchy = build_org_hierarchy(employees, top_user_email_override=email)
+        hierarchy = build_org_hierarchy(
+            employees, top_user_email_override=email, email_index=by_email,
+        )
         
         if hierarchy:
             return jsonify({
@@ -984,6 +1423,40 @@ def test_hierarchy(email):
         logger.error(f"Error in test hierarchy: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _hash_upload(stream, digest_size):
+    """Return a short blake2b hex name for an upload and rewind the stream."""
+    digest = hashlib.blake2b(digest_size=digest_size)
+    for chunk in iter(lambda: stream.read(_UPLOAD_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def _save_upload_hashed(stream, name_template, digest_size):
+    """Copy an upload into DATA_DIR in one pass, naming it by its content hash.
+
+    Returns ``(file_hash, path)``; ``name_template`` receives the hash.
+    """
+    digest = hashlib.blake2b(digest_size=digest_size)
+    fd, tmp_path = create_temp_file(DATA_DIR, suffix='.upload')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            for chunk in iter(lambda: stream.read(_UPLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                tmp_file.write(chunk)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+    file_hash = digest.hexdigest()
+    path = os.path.join(DATA_DIR, name_template.format(file_hash))
+    os.replace(tmp_path, path)
+    return file_hash, path
+
+
 @app.route('/api/upload-logo', methods=['POST'])
 @require_auth
 @limiter.limit(RATE_LIMIT_UPLOAD)
@@ -1011,46 +1484,44 @@ def upload_logo():
             
             # Generate secure filename
             filename = secure_filename(file.filename)
-            file_hash = hashlib.md5(file.read()).hexdigest()[:8]
-            file.seek(0)  # Reset after reading for hash
-            
-            custom_logo_path = os.path.join(DATA_DIR, f'icon_custom_{file_hash}.png')
-            
+
             # Check if directory is writable
             if not os.access(DATA_DIR, os.W_OK):
                 return jsonify({'error': 'Server configuration error'}), 500
 
-            file.save(custom_logo_path)
-            
-            # Verify file was saved
-            if not os.path.exists(custom_logo_path):
-                return jsonify({'error': 'Failed to save file'}), 500
+            # Hash while copying so the upload is read once and never held whole
+            file_hash, _ = _save_upload_hashed(
+                file.stream, 'icon_custom_{}.png', digest_size=4,
+            )
             
-            settings = load_settings()
-            settings['logoPath'] = f'/static/icon_custom_{file_hash}.png'
-            save_settings(settings)
+            logo_path = f'/static/icon_custom_{file_hash}.png'
+            update_settings({'logoPath': logo_path})
             
-            return jsonify({'success': True, 'path': settings['logoPath']})
+            return jsonify({'success': True, 'path': logo_path})
         else:
             return jsonify({'error': 'Invalid file type. Only PNG, JPG, JPEG allowed'}), 400
     except Exception as e:
         logger.error(f"Error uploading logo: {e}")
         return jsonify({'error': 'Upload failed'}), 500
 
+def _unlink_data_files(prefix, suffix=''):
+    """Delete DATA_DIR entries named ``prefix*suffix`` in a single directory scan."""
+    with os.scandir(DATA_DIR) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(entry.path)
+
+
 @app.route('/api/reset-logo', methods=['POST'])
 @require_auth
 def reset_logo():
     try:
         # Remove any custom logo files from data directory
-        import glob
-        custom_logos = glob.glob(os.path.join(DATA_DIR, 'icon_custom*.png'))
-        for logo_path in custom_logos:
-            if os.path.exists(logo_path):
-                os.remove(logo_path)
+        _unlink_data_files('icon_custom', '.png')
         
-        settings = load_settings()
-        settings['logoPath'] = '/static/icon.png'
-        save_settings(settings)
+        update_settings({'logoPath': '/static/icon.png'})
         
         return jsonify({'success': True})
     except Exception as e:
@@ -1077,68 +1548,47 @@ def upload_favicon():
         if file_size > MAX_FILE_SIZE:
             return jsonify({'error': f'File size exceeds {MAX_FILE_SIZE // (1024*1024)}MB limit'}), 400
         
-        # Check file extension
-        filename = secure_filename(file.filename)
-        file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
+        # Quick gate on the claimed type; the stored name never uses the client filename
+        file_ext = _file_extension(file.filename)
         
         if file_ext in FAVICON_ALLOWED_EXTENSIONS or file.content_type in ['image/x-icon', 'image/png', 'image/jpeg']:
             # Create unique filename
-            import hashlib
-            file_content = file.read()
-            file_hash = hashlib.md5(file_content).hexdigest()[:12]
-            
-            # Determine file extension based on content type or filename
-            if file.content_type == 'image/x-icon' or file_ext == 'ico':
-                ext = 'ico'
-            elif file.content_type == 'image/png' or file_ext == 'png':
-                ext = 'png'
-            else:
-                ext = 'png'  # Default to PNG for jpg/jpeg
-            
-            favicon_filename = f'favicon_custom_{file_hash}.{ext}'
-            favicon_path = os.path.join(DATA_DIR, favicon_filename)
+            file_hash = _hash_upload(file.stream, digest_size=6)
             
             # Validate and process image
             try:
                 from PIL import Image
-                import io
                 
-                # Open and validate image
-                image = Image.open(io.BytesIO(file_content))
+                # Open and validate image; PIL reads from the upload stream
+                image = Image.open(file.stream)
+                
+                # The decoded format, not the client's filename or MIME type,
+                # decides what is stored: ICO files are kept as uploaded and
+                # everything else is normalised to a 32x32 PNG.
+                ext = 'ico' if image.format == 'ICO' else 'png'
+                favicon_path = os.path.join(DATA_DIR, f'favicon_custom_{file_hash}.{ext}')
                 
-                # Convert to appropriate format and resize if needed
                 if ext == 'ico':
-                    # For ICO files, keep original if it's already ICO, otherwise convert
-                    if image.format != 'ICO':
-                        # Resize to 32x32 for favicon
-                        image = image.resize((32, 32), Image.Resampling.LANCZOS)
-                        # Convert to RGBA if needed
-                        if image.mode != 'RGBA':
-                            image = image.convert('RGBA')
-                        image.save(favicon_path, 'ICO', sizes=[(32, 32)])
-                    else:
-                        with open(favicon_path, 'wb') as f:
-                            f.write(file_content)
+                    file.stream.seek(0)
+                    file.save(favicon_path)
                 else:
-                    # For PNG files
+                    # Let JPEG sources decode at a reduced DCT scale; no-op for other formats
+                    image.draft('RGB', (64, 64))
                     if image.size != (32, 32):
                         image = image.resize((32, 32), Image.Resampling.LANCZOS)
                     if image.mode != 'RGBA':
                         image = image.convert('RGBA')
-                    image.save(favicon_path, 'PNG', optimize=True)
+                    image.save(favicon_path, 'PNG')
                 
             except Exception as img_error:
                 logger.error(f"Image processing error: {img_error}")
                 return jsonify({'error': 'Invalid image file'}), 400
             
-            if os.path.exists(favicon_path):
-                settings = load_settings()
-                settings['faviconPath'] = f'/static/favicon_custom_{file_hash}.{ext}'
-                save_settings(settings)
-                
-                return jsonify({'success': True, 'path': settings['faviconPath']})
-            else:
-                return jsonify({'error': 'Failed to save file'}), 500
+            # image.save / file.save raise on failure, so the file is in place here
+            favicon_url = f'/static/favicon_custom_{file_hash}.{ext}'
+            update_settings({'faviconPath': favicon_url})
+            
+            return jsonify({'success': True, 'path': favicon_url})
         else:
             return jsonify({'error': 'Invalid file type. Only ICO, PNG, JPG, JPEG allowed'}), 400
     except Exception as e:
@@ -1150,15 +1600,9 @@ def upload_favicon():
 def reset_favicon():
     try:
         # Remove any custom favicon files from data directory
-        import glob
-        custom_favicons = glob.glob(os.path.join(DATA_DIR, 'favicon_custom*'))
-        for favicon_path in custom_favicons:
-            if os.path.exists(favicon_path):
-                os.remove(favicon_path)
+        _unlink_data_files('favicon_custom')
         
-        settings = load_settings()
-        settings['faviconPath'] = '/favicon.ico'
-        save_settings(settings)
+        update_settings({'faviconPath': '/favicon.ico'})
         
         return jsonify({'success': True})
     except Exception as e:
@@ -1170,11 +1614,7 @@ def reset_favicon():
 def reset_all_settings():
     try:
         # Remove any custom logo files
-        import glob
-        custom_logos = glob.glob(os.path.join(DATA_DIR, 'icon_custom*.png'))
-        for logo_path in custom_logos:
-            if os.path.exists(logo_path):
-                os.remove(logo_path)
+        _unlink_data_files('icon_custom', '.png')
         
         save_settings(DEFAULT_SETTINGS)
         save_email_config(DEFAULT_EMAIL_CONFIG)
@@ -1405,6 +1845,54 @@ def test_email_with_attachments():
         return jsonify({'error': 'An internal error occurred while sending email with attachments'}), 500
 
 
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def _styled_header_row(ws, header_texts):
+    """Return bold white-on-blue header cells ready for ``ws.append``."""
+    cells = []
+    for header_text in header_texts:
+        cell = WriteOnlyCell(ws, value=header_text)
+        cell.font = _HEADER_FONT
+        cell.fill = _HEADER_FILL
+        cell.alignment = _HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+
+def _send_workbook(wb, filename):
+    """Save *wb* to an anonymous temp file and send it as an attachment.
+
+    Serving from disk lets the WSGI server stream the file instead of
+    copying an in-memory buffer. The temp file is discarded as soon as the
+    server closes it after the response.
+    """
+    tmp_file = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        wb.save(tmp_file)
+        tmp_file.seek(0)
+        return send_file(
+            tmp_file,
+            as_attachment=True,
+            download_name=filename,
+            mimetype=XLSX_MIMETYPE,
+        )
+    except Exception:
+        tmp_file.close()
+        raise
+
+
+# exportXlsxColumns modes (lowercased, '_' and '-' removed) limited to signed-in admins.
+_ADMIN_ONLY_EXPORT_MODES = frozenset({'admin', 'showadminonly', 'adminonly'})
+
+
+def _export_column_visible(raw_mode, is_admin):
+    mode = str(raw_mode).lower().replace('_', '').replace('-', '')
+    if mode == 'hide':
+        return False
+    return is_admin or mode not in _ADMIN_ONLY_EXPORT_MODES
+
+
 @app.route('/api/export-xlsx')
 def export_xlsx():
     """Export organizational data to XLSX format"""
@@ -1431,88 +1919,58 @@ def export_xlsx():
         export_column_settings = settings.get('exportXlsxColumns', {}) or {}
         is_admin = bool(session.get('authenticated'))
 
+        # (setting key, header, node key or None for the manager name, value transform)
         column_definitions = [
-            ('name', 'Name', lambda node, manager: node.get('name', '')),
-            ('title', 'Title', lambda node, manager: node.get('title', '')),
-            ('department', 'Department', lambda node, manager: node.get('department', '')),
-            ('email', 'Email', lambda node, manager: node.get('email', '')),
-            ('phone', 'Phone', lambda node, manager: node.get('phone', '')),
-            ('businessPhone', 'Business Phone', lambda node, manager: node.get('businessPhone', '')),
-            ('hireDate', 'Hire Date', lambda node, manager: format_hire_date(node.get('hireDate', ''))),
-            ('country', 'Country', lambda node, manager: node.get('country', '')),
-            ('state', 'State', lambda node, manager: node.get('state', '')),
-            ('city', 'City', lambda node, manager: node.get('city', '')),
-            ('office', 'Office', lambda node, manager: node.get('officeLocation', '')),
-            ('manager', 'Manager', lambda node, manager: manager)
+            ('name', 'Name', 'name', None),
+            ('title', 'Title', 'title', None),
+            ('department', 'Department', 'department', None),
+            ('email', 'Email', 'email', None),
+            ('phone', 'Phone', 'phone', None),
+            ('businessPhone', 'Business Phone', 'businessPhone', None),
+            ('hireDate', 'Hire Date', 'hireDate', format_hire_date),
+            ('country', 'Country', 'country', None),
+            ('state', 'State', 'state', None),
+            ('city', 'City', 'city', None),
+            ('office', 'Office', 'officeLocation', None),
+            ('manager', 'Manager', None, None)
         ]
 
-        def column_is_visible(key):
-            raw_mode = export_column_settings.get(key, 'show')
-            mode = str(raw_mode).lower()
-            normalized_admin = mode.replace('_', '').replace('-', '')
-            if mode == 'hide':
-                return False
-            if mode == 'admin' and not is_admin:
-                return False
-            if normalized_admin in {'showadminonly', 'adminonly'} and not is_admin:
-                return False
-            return True
-
-        visible_columns = [col for col in column_definitions if column_is_visible(col[0])]
+        visible_columns = [
+            col for col in column_definitions
+            if _export_column_visible(export_column_settings.get(col[0], 'show'), is_admin)
+        ]
         if not visible_columns:
             # Always include at least the Name column to avoid empty exports
             visible_columns = [column_definitions[0]]
 
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Organization Chart"
+        # Create a streaming workbook; column widths must precede the rows
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Organization Chart")
+        for column_letter in _COL_LETTERS[:len(visible_columns)]:
+            ws.column_dimensions[column_letter].width = 20
 
         # Add headers with styling
-        for col_index, (_, header, _) in enumerate(visible_columns, 1):
-            cell = ws.cell(row=1, column=col_index, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-        
-        # Function to flatten organizational structure
-        def flatten_org_data(node, manager_name="", row_num=2):
-            if not node:
-                return row_num
-            
-            # Check if we should skip this employee based on filtering settings
+        ws.append(_styled_header_row(ws, [header for _, header, _, _ in visible_columns]))
+
+        extractors = [(node_key, transform) for _, _, node_key, transform in visible_columns]
+
+        def skip_node(node):
             title = node.get('title', '')
-            department = node.get('department', '')
-            account_enabled = node.get('accountEnabled', True)
-            user_type = (node.get('userType') or '').lower()
-            should_skip = (hide_no_title and (not title or title.strip() == '' or title.strip() == 'No Title')) or \
-                         (department_is_ignored(department, ignored_departments)) or \
-                         (hide_disabled_users and not account_enabled) or \
-                         (hide_guest_users and user_type == 'guest')
-            
-            # Add current employee only if not filtering them out
-            if not should_skip:
-                for col_index, (_, _, extractor) in enumerate(visible_columns, 1):
-                    ws.cell(row=row_num, column=col_index, value=extractor(node, manager_name))
-                row_num += 1
-            
-            # Add children (using current employee name as manager if not skipped, otherwise pass through current manager)
-            current_manager = node.get('name', '') if not should_skip else manager_name
-            for child in node.get('children', []):
-                row_num = flatten_org_data(child, current_manager, row_num)
-                
-            return row_num
-        
-        # Flatten the data starting from root
-        last_row = flatten_org_data(data)
-        
-        # Auto-adjust column widths
-        for col in range(1, len(visible_columns) + 1):
-            column = get_column_letter(col)
-            ws.column_dimensions[column].width = 20
-        
+            return (hide_no_title and (not title or title.strip() in ('', 'No Title'))) or \
+                   (ignored_departments and department_is_ignored(node.get('department', ''), ignored_departments)) or \
+                   (hide_disabled_users and not node.get('accountEnabled', True)) or \
+                   (hide_guest_users and (node.get('userType') or '').lower() == 'guest')
+
+        # Flatten the organizational structure depth-first, in chart order.
+        # Skipped employees pass their manager through to their children.
+        exported_count = 0
+        append_row = ws.append
+        for row in iter_org_chart_rows(data, extractors, skip_node):
+            append_row(row)
+            exported_count += 1
+
         # Generate filename
-        filename = f"org-chart-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
+        filename = f"org-chart-{date.today().isoformat()}.xlsx"
 
         filters = []
         if hide_disabled_users:
@@ -1528,36 +1986,204 @@ def export_xlsx():
             wb,
             filename=filename,
             sheet_title=ws.title,
-            item_count=last_row - 2,
+            item_count=exported_count,
             data_export_option=', '.join(filters) if filters else 'allData',
         )
 
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+        return _send_workbook(wb, filename)
         
     except Exception as e:
         logger.error(f"Error exporting to XLSX: {e}")
         return jsonify({'error': 'Failed to export XLSX'}), 500
+
+
+_MISSING_MANAGER_REASON_LABELS = {
+    'no_manager': 'No manager assigned',
+    'manager_not_found': 'Manager not found in data',
+    'detached': 'Detached from hierarchy',
+    'filtered': 'Filtered'
+}
+
+_FILTER_REASON_LABELS = {
+    'filter_disabled': 'Hidden: disabled user',
+    'filter_guest': 'Hidden: guest account',
+    'filter_no_title': 'Hidden: missing title',
+    'filter_ignored_title': 'Hidden: ignored title',
+    'filter_ignored_department': 'Hidden: ignored department',
+    'filter_ignored_employee': 'Hidden: ignored user'
+}
+
+
+def _join_list_cell(value, record):
+    return ", ".join(value) if isinstance(value, list) else value
+
+
+def _missing_manager_reason_cell(value, record):
+    return _MISSING_MANAGER_REASON_LABELS.get(value, value or '')
+
+
+def _filter_reasons_cell(value, record):
+    if isinstance(value, list):
+        return _filter_reasons_text(tuple(value))
+    return value
+
+
+@lru_cache(maxsize=256)
+def _filter_reasons_text(reasons):
+    return ", ".join(_FILTER_REASON_LABELS.get(reason, reason) for reason in reasons)
+
+
+def _format_disabled_date_cell(value, record):
+    if not value:
+        return value
+    if isinstance(value, str):
+        return _graph_date_text(value)
+    dt = parse_graph_datetime(value)
+    return dt.date().isoformat() if dt else value
+
+
+@lru_cache(maxsize=4096)
+def _graph_date_text(value):
+    # Repeat exports of the same cached report re-format identical timestamps.
+    dt = parse_graph_datetime(value)
+    return dt.date().isoformat() if dt else value
+
+
+def _format_hire_date_cell(value, record):
+    return format_hire_date(value) if value else value
+
+
+def _account_enabled_cell(value, record):
+    return 'Yes' if record.get('accountEnabled', True) else 'No'
+
+
+def _user_type_cell(value, record):
+    return _user_type_text(value) if value else ''
+
+
+@lru_cache(maxsize=64)
+def _user_type_text(value):
+    user_type = value.strip()
+    return user_type.capitalize() if user_type else ''
+
+
+def _yes_no_cell(value, record):
+    return 'Yes' if value else 'No'
+
+
+# Report exports start a new sheet every _XLSX_SEGMENT_ROWS records; the base
+# title is trimmed so "<title> <n>" stays within Excel's 31-character limit.
+_XLSX_SEGMENT_ROWS = 100_000
+_XLSX_SEGMENT_TITLE_CHARS = 27
+
+
+def _export_report_xlsx(sheet_title, headers, records, *, filename_prefix, column_width,
+                        data_export_option, transforms=None):
+    """Build a report workbook and send it as an attachment.
+
+    ``headers`` is a list of ``(record_key, header_text)`` pairs and
+    ``transforms`` optionally maps a record key to ``fn(value, record)`` for
+    columns that need formatting before they are written. Records past
+    ``_XLSX_SEGMENT_ROWS`` continue on numbered sheets with the same headers.
+    """
+    transforms = transforms or {}
+    wb = Workbook(write_only=True)
+    header_texts = [header_text for _, header_text in headers]
+
+    def start_sheet(title):
+        ws = wb.create_sheet(title)
+        for column_letter in _COL_LETTERS[:len(headers)]:
+            ws.column_dimensions[column_letter].width = column_width
+        ws.append(_styled_header_row(ws, header_texts))
+        return ws
+
+    first_ws = start_sheet(sheet_title)
+
+    # Project each record in one pass, then patch only the transformed columns.
+    keys = [key for key, _ in headers]
+    transform_slots = [
+        (index, transforms[key]) for index, key in enumerate(keys) if transforms.get(key)
+    ]
+    append_row = first_ws.append
+    for row_index, record in enumerate(records):
+        if row_index and row_index % _XLSX_SEGMENT_ROWS == 0:
+            # Very large tenants: continue on a new sheet so none grows unwieldy in Excel.
+            segment = row_index // _XLSX_SEGMENT_ROWS + 1
+            append_row = start_sheet(f"{sheet_title[:_XLSX_SEGMENT_TITLE_CHARS]} {segment}").append
+        get = record.get
+        row = [get(key) for key in keys]
+        for index, transform in transform_slots:
+            row[index] = transform(row[index], record)
+        append_row(row)
+
+    filename = f"{filename_prefix}-{date.today().isoformat()}.xlsx"
+
+    add_metadata_sheet(
+        wb,
+        filename=filename,
+        sheet_title=first_ws.title,
+        item_count=len(records),
+        data_export_option=data_export_option,
+    )
+
+    return _send_workbook(wb, filename)
+
+
+_NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# json.dumps with non-default options builds a new JSONEncoder per call; the
+# report stream encodes one record at a time, so reuse a single encoder that
+# mirrors app.json's settings.
+_REPORT_RECORD_ENCODER = json.JSONEncoder(
+    ensure_ascii=app.json.ensure_ascii,
+    sort_keys=app.json.sort_keys,
+    default=app.json.default,
+)
+
+
+def _wants_ndjson():
+    """True when the client asked for line-delimited report records."""
+    best = request.accept_mimetypes.best_match(['application/json', _NDJSON_MIMETYPE])
+    return best == _NDJSON_MIMETYPE
+
+
+def _stream_report_json(records, **fields):
+    """Stream ``{"records": [...], "count": N, **fields}`` one record at a time.
+
+    Large report payloads are encoded incrementally instead of being built
+    as one string, so peak memory stays close to a single record. Clients
+    sending ``Accept: application/x-ndjson`` get one record per line followed
+    by a ``{"count": N, **fields}`` line they can parse as it arrives.
+    """
+    dumps = _REPORT_RECORD_ENCODER.encode
+    tail = {'count': len(records), **fields}
+
+    if _wants_ndjson():
+        def generate():
+            for record in records:
+                yield dumps(record) + '\n'
+            yield dumps(tail) + '\n'
+
+        mimetype = _NDJSON_MIMETYPE
+    else:
+        def generate():
+            yield '{"records": ['
+            for index, record in enumerate(records):
+                yield (',' if index else '') + dumps(record)
+            yield '], ' + dumps(tail)[1:]
+
+        mimetype = 'application/json'
+
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
 def _get_disabled_records_from_request(*, force_refresh=False, apply_filters=True):
-    licensed_only = request.args.get('licensedOnly', 'true').lower() == 'true'
-    include_guests = request.args.get('includeGuests', 'false').lower() == 'true'
-    include_members = request.args.get('includeMembers', 'true').lower() == 'true'
-    recent_days_raw = request.args.get('recentDays')
-    recent_days = None
-    if recent_days_raw not in (None, ''):
-        try:
-            recent_days = int(recent_days_raw)
-        except ValueError:
-            logger.warning(f"Invalid recentDays value provided: {recent_days_raw}")
+    licensed_only = _parse_bool_arg(request.args.get('licensedOnly'), default=True)
+    include_guests = _parse_bool_arg(request.args.get('includeGuests'), default=False)
+    include_members = _parse_bool_arg(request.args.get('includeMembers'), default=True)
+    recent_days = _parse_int_arg(request.args, 'recentDays', None)
 
     records = load_disabled_users_data(report_cache, force_refresh=force_refresh)
     filtered_records = (
@@ -1581,8 +2207,22 @@ def _get_disabled_records_from_request(*, force_refresh=False, apply_filters=Tru
     return filtered_records, filter_payload
 
 
+@lru_cache(maxsize=32)
+def _local_mtime_isoformat(mtime):
+    return datetime.fromtimestamp(mtime).isoformat()
+
+
+def _report_generated_at(path):
+    """Local ISO timestamp of a report cache file's mtime, or None if it is missing."""
+    try:
+        return _local_mtime_isoformat(os.stat(path).st_mtime)
+    except OSError:
+        return None
+
+
 @app.route('/api/reports/missing-manager')
 @require_auth
+@_cache_file_etag(MISSING_MANAGER_FILE, EMPLOYEE_LIST_FILE)
 def get_missing_manager_report():
     try:
         refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
@@ -1594,9 +2234,7 @@ def get_missing_manager_report():
         records = _apply_scope_filter(records, scope)
         filtered_records = apply_missing_manager_filters(records, **toggles)
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
-        generated_at = None
-        if os.path.exists(MISSING_MANAGER_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(MISSING_MANAGER_FILE)).isoformat()
+        generated_at = _report_generated_at(MISSING_MANAGER_FILE)
 
         return jsonify({
             'records': filtered_records,
@@ -1611,6 +2249,7 @@ def get_missing_manager_report():
 
 @app.route('/api/reports/missing-manager/export')
 @require_auth
+@_cache_file_etag(MISSING_MANAGER_FILE, EMPLOYEE_LIST_FILE, SETTINGS_FILE)
 def export_missing_manager_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
@@ -1626,10 +2265,6 @@ def export_missing_manager_report():
         filtered_records = apply_missing_manager_filters(records, **toggles)
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Missing Managers"
-
         headers = [
             ('name', 'Name'),
             ('title', 'Title'),
@@ -1641,49 +2276,14 @@ def export_missing_manager_report():
             ('reason', 'Reason')
         ]
 
-        reason_labels = {
-            'no_manager': 'No manager assigned',
-            'manager_not_found': 'Manager not found in data',
-            'detached': 'Detached from hierarchy',
-            'filtered': 'Filtered'
-        }
-
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(filtered_records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                value = record.get(key)
-                if key == 'reason':
-                    value = reason_labels.get(value, value or '')
-                ws.cell(row=row_index, column=column_index, value=value)
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 22
-
-        filename = f"missing-managers-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(filtered_records),
+        return _export_report_xlsx(
+            "Missing Managers",
+            headers,
+            filtered_records,
+            filename_prefix='missing-managers',
+            column_width=22,
             data_export_option=format_export_filters(scope, toggles, tp),
-        )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            transforms={'reason': _missing_manager_reason_cell},
         )
     except Exception as e:
         logger.error(f"Error exporting missing manager report: {e}")
@@ -1692,6 +2292,7 @@ def export_missing_manager_report():
 
 @app.route('/api/reports/missing-photo')
 @require_auth
+@_cache_file_etag(MISSING_PHOTO_FILE, EMPLOYEE_LIST_FILE)
 def get_missing_photo_report():
     try:
         refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
@@ -1703,9 +2304,7 @@ def get_missing_photo_report():
         records = _apply_scope_filter(records, scope)
         filtered_records = apply_missing_photo_filters(records, **toggles)
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
-        generated_at = None
-        if os.path.exists(MISSING_PHOTO_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(MISSING_PHOTO_FILE)).isoformat()
+        generated_at = _report_generated_at(MISSING_PHOTO_FILE)
 
         return jsonify({
             'records': filtered_records,
@@ -1720,6 +2319,7 @@ def get_missing_photo_report():
 
 @app.route('/api/reports/missing-photo/export')
 @require_auth
+@_cache_file_etag(MISSING_PHOTO_FILE, EMPLOYEE_LIST_FILE, SETTINGS_FILE)
 def export_missing_photo_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
@@ -1735,10 +2335,6 @@ def export_missing_photo_report():
         filtered_records = apply_missing_photo_filters(records, **toggles)
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Missing Photos"
-
         headers = [
             ('name', 'Name'),
             ('title', 'Title'),
@@ -1747,40 +2343,14 @@ def export_missing_photo_report():
             ('country', 'Country'),
         ]
 
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(filtered_records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                ws.cell(row=row_index, column=column_index, value=record.get(key))
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 22
-
-        filename = f"missing-photos-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(filtered_records),
+        return _export_report_xlsx(
+            "Missing Photos",
+            headers,
+            filtered_records,
+            filename_prefix='missing-photos',
+            column_width=22,
             data_export_option=format_export_filters(scope, toggles, tp),
         )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
     except Exception as e:
         logger.error(f"Error exporting missing photo report: {e}")
         return jsonify({'error': 'Failed to export report'}), 500
@@ -1788,6 +2358,7 @@ def export_missing_photo_report():
 
 @app.route('/api/reports/missing-hire-date')
 @require_auth
+@_cache_file_etag(MISSING_HIRE_DATE_FILE, EMPLOYEE_LIST_FILE)
 def get_missing_hire_date_report():
     try:
         refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
@@ -1799,9 +2370,7 @@ def get_missing_hire_date_report():
         records = _apply_scope_filter(records, scope)
         filtered_records = apply_missing_hire_date_filters(records, **toggles)
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
-        generated_at = None
-        if os.path.exists(MISSING_HIRE_DATE_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(MISSING_HIRE_DATE_FILE)).isoformat()
+        generated_at = _report_generated_at(MISSING_HIRE_DATE_FILE)
 
         return jsonify({
             'records': filtered_records,
@@ -1816,6 +2385,7 @@ def get_missing_hire_date_report():
 
 @app.route('/api/reports/missing-hire-date/export')
 @require_auth
+@_cache_file_etag(MISSING_HIRE_DATE_FILE, EMPLOYEE_LIST_FILE, SETTINGS_FILE)
 def export_missing_hire_date_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
@@ -1831,10 +2401,6 @@ def export_missing_hire_date_report():
         filtered_records = apply_missing_hire_date_filters(records, **toggles)
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Missing Hire Date"
-
         headers = [
             ('name', 'Name'),
             ('title', 'Title'),
@@ -1843,40 +2409,14 @@ def export_missing_hire_date_report():
             ('country', 'Country'),
         ]
 
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(filtered_records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                ws.cell(row=row_index, column=column_index, value=record.get(key))
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 22
-
-        filename = f"missing-hire-date-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(filtered_records),
+        return _export_report_xlsx(
+            "Missing Hire Date",
+            headers,
+            filtered_records,
+            filename_prefix='missing-hire-date',
+            column_width=22,
             data_export_option=format_export_filters(scope, toggles, tp),
         )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
     except Exception as e:
         logger.error(f"Error exporting missing hire date report: {e}")
         return jsonify({'error': 'Failed to export report'}), 500
@@ -1884,6 +2424,7 @@ def export_missing_hire_date_report():
 
 @app.route('/api/reports/dirty-data')
 @require_auth
+@_cache_file_etag(DIRTY_DATA_FILE, EMPLOYEE_LIST_FILE)
 def get_dirty_data_report():
     try:
         refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
@@ -1908,9 +2449,7 @@ def get_dirty_data_report():
             include_guests=include_guests,
         )
 
-        generated_at = None
-        if os.path.exists(DIRTY_DATA_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(DIRTY_DATA_FILE)).isoformat()
+        generated_at = _report_generated_at(DIRTY_DATA_FILE)
 
         return jsonify({
             'records': filtered_records,
@@ -1924,6 +2463,7 @@ def get_dirty_data_report():
 
 @app.route('/api/reports/dirty-data/export')
 @require_auth
+@_cache_file_etag(DIRTY_DATA_FILE, EMPLOYEE_LIST_FILE, SETTINGS_FILE)
 def export_dirty_data_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
@@ -1951,10 +2491,6 @@ def export_dirty_data_report():
             include_guests=include_guests,
         )
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Data Quality Issues"
-
         headers = [
             ('name', 'Name'),
             ('title', 'Title'),
@@ -1964,40 +2500,14 @@ def export_dirty_data_report():
             ('issueFields', 'Affected Fields'),
         ]
 
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(filtered_records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                ws.cell(row=row_index, column=column_index, value=record.get(key))
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 22
-
-        filename = f"data-quality-issues-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(filtered_records),
+        return _export_report_xlsx(
+            "Data Quality Issues",
+            headers,
+            filtered_records,
+            filename_prefix='data-quality-issues',
+            column_width=22,
             data_export_option=format_export_filters(scope, {}, {}),
         )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
     except Exception as e:
         logger.error(f"Error exporting dirty data report: {e}")
         return jsonify({'error': 'Failed to export report'}), 500
@@ -2005,17 +2515,16 @@ def export_dirty_data_report():
 
 @app.route('/api/reports/disabled-users')
 @require_auth
+@_cache_file_etag(DISABLED_USERS_FILE)
 def get_disabled_users_report():
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         filtered_records, applied_filters = _get_disabled_records_from_request(
             force_refresh=refresh,
             apply_filters=True
         )
 
-        generated_at = None
-        if os.path.exists(DISABLED_USERS_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(DISABLED_USERS_FILE)).isoformat()
+        generated_at = _report_generated_at(DISABLED_USERS_FILE)
 
         return jsonify({
             'records': filtered_records,
@@ -2030,21 +2539,18 @@ def get_disabled_users_report():
 
 @app.route('/api/reports/disabled-users/export')
 @require_auth
+@_cache_file_etag(DISABLED_USERS_FILE, SETTINGS_FILE)
 def export_disabled_users_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
 
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         records, applied_filters = _get_disabled_records_from_request(
             force_refresh=refresh,
             apply_filters=True
         )
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Disabled Users"
-
         headers = [
             ('name', 'Name'),
             ('email', 'Email'),
@@ -2056,49 +2562,17 @@ def export_disabled_users_report():
             ('licenseSkus', 'Licenses')
         ]
 
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                value = record.get(key)
-                if key == 'licenseSkus' and isinstance(value, list):
-                    value = ", ".join(value)
-                elif key == 'disabledDate' and value:
-                    dt = parse_graph_datetime(value)
-                    value = dt.date().isoformat() if dt else value
-                ws.cell(row=row_index, column=column_index, value=value)
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 24
-
-        filename = f"disabled-users-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        filter_parts = []
-        for k, v in applied_filters.items():
-            filter_parts.append(f"{k}={v}")
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(records),
-            data_export_option=', '.join(filter_parts) if filter_parts else 'allData',
-        )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        return _export_report_xlsx(
+            "Disabled Users",
+            headers,
+            records,
+            filename_prefix='disabled-users',
+            column_width=24,
+            data_export_option=', '.join(f"{k}={v}" for k, v in applied_filters.items()) or 'allData',
+            transforms={
+                'disabledDate': _format_disabled_date_cell,
+                'licenseSkus': _join_list_cell,
+            },
         )
     except Exception as e:
         logger.error(f"Error exporting disabled users report: {e}")
@@ -2107,26 +2581,19 @@ def export_disabled_users_report():
 
 @app.route('/api/reports/disabled-this-year')
 @require_auth
+@_cache_file_etag(DISABLED_USERS_FILE, RECENTLY_DISABLED_FILE, remember=True)
 def get_recently_disabled_report():
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         all_records, base_filters = _get_disabled_records_from_request(
             force_refresh=refresh,
             apply_filters=False
         )
 
-        recent_days_raw = request.args.get('recentDays')
-        if recent_days_raw in (None, ''):
-            recent_days = 365
-        else:
-            try:
-                recent_days = int(recent_days_raw)
-            except ValueError:
-                logger.warning(f"Invalid recentDays value provided for recently disabled report: {recent_days_raw}")
-                recent_days = 365
+        recent_days = _parse_int_arg(request.args, 'recentDays', 365)
 
-        licensed_only = request.args.get('licensedOnly', 'false').lower() == 'true'
-        include_guests = request.args.get('includeGuests', 'false').lower() == 'true'
+        licensed_only = _parse_bool_arg(request.args.get('licensedOnly'), default=False)
+        include_guests = _parse_bool_arg(request.args.get('includeGuests'), default=False)
 
         records = apply_disabled_filters(
             all_records,
@@ -2134,9 +2601,7 @@ def get_recently_disabled_report():
             recent_days=recent_days,
             include_guests=include_guests
         )
-        generated_at = None
-        if os.path.exists(RECENTLY_DISABLED_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(RECENTLY_DISABLED_FILE)).isoformat()
+        generated_at = _report_generated_at(RECENTLY_DISABLED_FILE)
 
         return jsonify({
             'records': records,
@@ -2155,29 +2620,22 @@ def get_recently_disabled_report():
 
 @app.route('/api/reports/disabled-this-year/export')
 @require_auth
+@_cache_file_etag(DISABLED_USERS_FILE, RECENTLY_DISABLED_FILE, SETTINGS_FILE)
 def export_recently_disabled_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
 
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         all_records, _ = _get_disabled_records_from_request(
             force_refresh=refresh,
             apply_filters=False
         )
 
-        recent_days_raw = request.args.get('recentDays')
-        if recent_days_raw in (None, ''):
-            recent_days = 365
-        else:
-            try:
-                recent_days = int(recent_days_raw)
-            except ValueError:
-                logger.warning(f"Invalid recentDays value provided for recently disabled export: {recent_days_raw}")
-                recent_days = 365
+        recent_days = _parse_int_arg(request.args, 'recentDays', 365)
 
-        licensed_only = request.args.get('licensedOnly', 'false').lower() == 'true'
-        include_guests = request.args.get('includeGuests', 'false').lower() == 'true'
+        licensed_only = _parse_bool_arg(request.args.get('licensedOnly'), default=False)
+        include_guests = _parse_bool_arg(request.args.get('includeGuests'), default=False)
 
         records = apply_disabled_filters(
             all_records,
@@ -2186,10 +2644,6 @@ def export_recently_disabled_report():
             include_guests=include_guests
         )
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Disabled Last 365 Days"
-
         headers = [
             ('name', 'Name'),
             ('email', 'Email'),
@@ -2201,45 +2655,17 @@ def export_recently_disabled_report():
             ('licenseSkus', 'Licenses')
         ]
 
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                value = record.get(key)
-                if key == 'licenseSkus' and isinstance(value, list):
-                    value = ", ".join(value)
-                elif key == 'disabledDate' and value:
-                    dt = parse_graph_datetime(value)
-                    value = dt.date().isoformat() if dt else value
-                ws.cell(row=row_index, column=column_index, value=value)
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 24
-
-        filename = f"disabled-last-365-days-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(records),
+        return _export_report_xlsx(
+            "Disabled Last 365 Days",
+            headers,
+            records,
+            filename_prefix='disabled-last-365-days',
+            column_width=24,
             data_export_option=f"recentDays={recent_days}, licensedOnly={licensed_only}, includeGuests={include_guests}",
-        )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            transforms={
+                'disabledDate': _format_disabled_date_cell,
+                'licenseSkus': _join_list_cell,
+            },
         )
     except Exception as e:
         logger.error(f"Error exporting recently disabled report: {e}")
@@ -2248,17 +2674,16 @@ def export_recently_disabled_report():
 
 @app.route('/api/reports/hired-this-year')
 @require_auth
+@_cache_file_etag(RECENTLY_HIRED_FILE, EMPLOYEE_LIST_FILE)
 def get_recently_hired_report():
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         scope = request.args.get('scope', 'orgChart')
         tp = _parse_tagpicker_args(request.args)
         records = load_recently_hired_data(report_cache, force_refresh=refresh)
         records = _apply_scope_filter(records, scope)
         records = apply_tagpicker_filters(records, **tp)
-        generated_at = None
-        if os.path.exists(RECENTLY_HIRED_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(RECENTLY_HIRED_FILE)).isoformat()
+        generated_at = _report_generated_at(RECENTLY_HIRED_FILE)
 
         return jsonify({
             'records': records,
@@ -2272,22 +2697,19 @@ def get_recently_hired_report():
 
 @app.route('/api/reports/hired-this-year/export')
 @require_auth
+@_cache_file_etag(RECENTLY_HIRED_FILE, EMPLOYEE_LIST_FILE, SETTINGS_FILE)
 def export_recently_hired_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
 
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         scope = request.args.get('scope', 'orgChart')
         tp = _parse_tagpicker_args(request.args)
         records = load_recently_hired_data(report_cache, force_refresh=refresh)
         records = _apply_scope_filter(records, scope)
         records = apply_tagpicker_filters(records, **tp)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Hired Last 365 Days"
-
         headers = [
             ('name', 'Name'),
             ('email', 'Email'),
@@ -2301,57 +2723,51 @@ def export_recently_hired_report():
             ('location', 'Location')
         ]
 
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
+        return _export_report_xlsx(
+            "Hired Last 365 Days",
+            headers,
+            records,
+            filename_prefix='hired-last-365-days',
+            column_width=24,
+            data_export_option=format_export_filters(scope, tp=tp),
+            transforms={'hireDate': _format_hire_date_cell},
+        )
+    except Exception as e:
+        logger.error(f"Error exporting recently hired report: {e}")
+        return jsonify({'error': 'Failed to export report'}), 500
 
-        for row_index, record in enumerate(records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                value = record.get(key)
-                if key == 'hireDate' and value:
-                    value = format_hire_date(value)
-                ws.cell(row=row_index, column=column_index, value=value)
 
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 24
+def _parse_int_arg(args, name, default):
+    """Return query arg ``name`` as an int, or ``default`` when absent or malformed."""
+    raw = args.get(name)
+    if raw in (None, ''):
+        return default
+    text = raw.strip()
+    digits = text[1:] if text[:1] in ('+', '-') else text
+    if digits.isdecimal():
+        return int(text)
+    logger.warning(f"Invalid {name} value provided: {raw}")
+    return default
 
-        filename = f"hired-last-365-days-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
 
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(records),
-            data_export_option=format_export_filters(scope, tp=tp),
-        )
+def _parse_optional_arg(args, name):
+    """Return query arg ``name`` unchanged, treating blank/'null'/'None' as absent."""
+    raw = args.get(name)
+    if raw in (None, '', 'null', 'None'):
+        return None
+    return raw
 
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
 
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-    except Exception as e:
-        logger.error(f"Error exporting recently hired report: {e}")
-        return jsonify({'error': 'Failed to export report'}), 500
+_BOOL_ARG_VALUES = {
+    'true': True, '1': True, 'yes': True, 'on': True,
+    'false': False, '0': False, 'no': False, 'off': False,
+}
 
 
 def _parse_bool_arg(value, default=True):
     if value is None:
         return default
-    lowered = value.strip().lower()
-    if lowered in {'true', '1', 'yes', 'on'}:
-        return True
-    if lowered in {'false', '0', 'no', 'off'}:
-        return False
-    return default
+    return _BOOL_ARG_VALUES.get(value.strip().lower(), default)
 
 
 def _parse_tagpicker_args(args):
@@ -2405,6 +2821,26 @@ def _parse_tagpicker_args(args):
     }
 
 
+# (filter kwarg, query parameter, fallback default) for _parse_standard_toggle_args.
+_STANDARD_TOGGLE_ARGS = (
+    ('include_user_mailboxes', 'includeUserMailboxes', True),
+    ('include_shared_mailboxes', 'includeSharedMailboxes', False),
+    ('include_room_equipment_mailboxes', 'includeRoomEquipmentMailboxes', False),
+    ('include_enabled', 'includeEnabled', True),
+    ('include_disabled', 'includeDisabled', False),
+    ('include_licensed', 'includeLicensed', True),
+    ('include_unlicensed', 'includeUnlicensed', True),
+    ('include_members', 'includeMembers', True),
+    ('include_guests', 'includeGuests', False),
+    ('include_hidden_from_address_list', 'includeHiddenFromAddressList', True),
+    ('include_visible_in_address_list', 'includeVisibleInAddressList', True),
+    ('include_with_mailbox', 'includeWithMailbox', True),
+    ('include_without_mailbox', 'includeWithoutMailbox', True),
+    ('include_with_manager', 'includeWithManager', True),
+    ('include_without_manager', 'includeWithoutManager', True),
+)
+
+
 def _parse_standard_toggle_args(args, defaults=None):
     """Parse the standard 9 toggle filter params from request args.
 
@@ -2413,21 +2849,8 @@ def _parse_standard_toggle_args(args, defaults=None):
     """
     d = defaults or {}
     return {
-        'include_user_mailboxes': _parse_bool_arg(args.get('includeUserMailboxes'), default=d.get('include_user_mailboxes', True)),
-        'include_shared_mailboxes': _parse_bool_arg(args.get('includeSharedMailboxes'), default=d.get('include_shared_mailboxes', False)),
-        'include_room_equipment_mailboxes': _parse_bool_arg(args.get('includeRoomEquipmentMailboxes'), default=d.get('include_room_equipment_mailboxes', False)),
-        'include_enabled': _parse_bool_arg(args.get('includeEnabled'), default=d.get('include_enabled', True)),
-        'include_disabled': _parse_bool_arg(args.get('includeDisabled'), default=d.get('include_disabled', False)),
-        'include_licensed': _parse_bool_arg(args.get('includeLicensed'), default=d.get('include_licensed', True)),
-        'include_unlicensed': _parse_bool_arg(args.get('includeUnlicensed'), default=d.get('include_unlicensed', True)),
-        'include_members': _parse_bool_arg(args.get('includeMembers'), default=d.get('include_members', True)),
-        'include_guests': _parse_bool_arg(args.get('includeGuests'), default=d.get('include_guests', False)),
-        'include_hidden_from_address_list': _parse_bool_arg(args.get('includeHiddenFromAddressList'), default=d.get('include_hidden_from_address_list', True)),
-        'include_visible_in_address_list': _parse_bool_arg(args.get('includeVisibleInAddressList'), default=d.get('include_visible_in_address_list', True)),
-        'include_with_mailbox': _parse_bool_arg(args.get('includeWithMailbox'), default=d.get('include_with_mailbox', True)),
-        'include_without_mailbox': _parse_bool_arg(args.get('includeWithoutMailbox'), default=d.get('include_without_mailbox', True)),
-        'include_with_manager': _parse_bool_arg(args.get('includeWithManager'), default=d.get('include_with_manager', True)),
-        'include_without_manager': _parse_bool_arg(args.get('includeWithoutManager'), default=d.get('include_without_manager', True)),
+        name: _parse_bool_arg(args.get(query_key), default=d.get(name, fallback))
+        for name, query_key, fallback in _STANDARD_TOGGLE_ARGS
     }
 
 
@@ -2452,6 +2875,7 @@ def _apply_scope_filter(records, scope):
 
 @app.route('/api/reports/last-logins')
 @require_auth
+@_cache_file_etag(LAST_LOGIN_FILE, EMPLOYEE_LIST_FILE, remember=True)
 def get_last_logins_report():
     try:
         refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
@@ -2475,15 +2899,8 @@ def get_last_logins_report():
         include_without_manager = _parse_bool_arg(request.args.get('includeWithoutManager'), default=True)
         tp = _parse_tagpicker_args(request.args)
 
-        inactive_days_raw = request.args.get('inactiveDays')
-        inactive_days = None
-        if inactive_days_raw not in (None, '', 'null', 'None'):
-            inactive_days = inactive_days_raw
-
-        inactive_days_max_raw = request.args.get('inactiveDaysMax')
-        inactive_days_max = None
-        if inactive_days_max_raw not in (None, '', 'null', 'None'):
-            inactive_days_max = inactive_days_max_raw
+        inactive_days = _parse_optional_arg(request.args, 'inactiveDays')
+        inactive_days_max = _parse_optional_arg(request.args, 'inactiveDaysMax')
 
         records = load_last_login_data(report_cache, force_refresh=refresh)
         records = _apply_scope_filter(records, scope)
@@ -2510,9 +2927,7 @@ def get_last_logins_report():
         )
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
 
-        generated_at = None
-        if os.path.exists(LAST_LOGIN_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(LAST_LOGIN_FILE)).isoformat()
+        generated_at = _report_generated_at(LAST_LOGIN_FILE)
 
         return jsonify({
             'records': filtered_records,
@@ -2547,6 +2962,7 @@ def get_last_logins_report():
 
 @app.route('/api/reports/last-logins/export')
 @require_auth
+@_cache_file_etag(LAST_LOGIN_FILE, EMPLOYEE_LIST_FILE, SETTINGS_FILE)
 def export_last_logins_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
@@ -2571,15 +2987,8 @@ def export_last_logins_report():
         include_without_mailbox = _parse_bool_arg(request.args.get('includeWithoutMailbox'), default=True)
         include_with_manager = _parse_bool_arg(request.args.get('includeWithManager'), default=True)
         include_without_manager = _parse_bool_arg(request.args.get('includeWithoutManager'), default=True)
-        inactive_days_raw = request.args.get('inactiveDays')
-        inactive_days = None
-        if inactive_days_raw not in (None, '', 'null', 'None'):
-            inactive_days = inactive_days_raw
-
-        inactive_days_max_raw = request.args.get('inactiveDaysMax')
-        inactive_days_max = None
-        if inactive_days_max_raw not in (None, '', 'null', 'None'):
-            inactive_days_max = inactive_days_max_raw
+        inactive_days = _parse_optional_arg(request.args, 'inactiveDays')
+        inactive_days_max = _parse_optional_arg(request.args, 'inactiveDaysMax')
 
         tp = _parse_tagpicker_args(request.args)
 
@@ -2608,10 +3017,6 @@ def export_last_logins_report():
         )
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Users by Last Sign-In"
-
         headers = [
             ('name', 'Name'),
             ('title', 'Title'),
@@ -2630,37 +3035,12 @@ def export_last_logins_report():
             ('licenseSkus', 'Licenses')
         ]
 
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(filtered_records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                value = record.get(key)
-                if key == 'accountEnabled':
-                    value = 'Yes' if record.get('accountEnabled', True) else 'No'
-                elif key == 'userType':
-                    user_type = (record.get('userType') or '').strip()
-                    value = user_type.capitalize() if user_type else ''
-                elif key == 'neverSignedIn':
-                    value = 'Yes' if record.get('neverSignedIn') else 'No'
-                elif key == 'licenseSkus' and isinstance(value, list):
-                    value = ', '.join(value)
-                ws.cell(row=row_index, column=column_index, value=value)
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 26
-
-        filename = f"last-logins-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(filtered_records),
+        return _export_report_xlsx(
+            "Users by Last Sign-In",
+            headers,
+            filtered_records,
+            filename_prefix='last-logins',
+            column_width=26,
             data_export_option=format_export_filters(scope, {
                 'include_user_mailboxes': include_user_mailboxes,
                 'include_shared_mailboxes': include_shared_mailboxes,
@@ -2672,17 +3052,12 @@ def export_last_logins_report():
                 'include_members': include_members,
                 'include_guests': include_guests,
             }, tp),
-        )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            transforms={
+                'accountEnabled': _account_enabled_cell,
+                'userType': _user_type_cell,
+                'neverSignedIn': _yes_no_cell,
+                'licenseSkus': _join_list_cell,
+            },
         )
     except Exception as error:
         logger.error(f"Error exporting last sign-in report: {error}")
@@ -2691,15 +3066,16 @@ def export_last_logins_report():
 
 @app.route('/api/reports/disabled-licensed')
 @require_auth
+@_cache_file_etag(DISABLED_USERS_FILE, DISABLED_LICENSE_FILE, remember=True)
 def get_disabled_licensed_report():
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         all_records, base_filters = _get_disabled_records_from_request(
             force_refresh=refresh,
             apply_filters=False
         )
 
-        include_guests = request.args.get('includeGuests', 'false').lower() == 'true'
+        include_guests = _parse_bool_arg(request.args.get('includeGuests'), default=False)
         recent_days = base_filters.get('recentDays')
         filtered_records = apply_disabled_filters(
             all_records,
@@ -2707,20 +3083,17 @@ def get_disabled_licensed_report():
             recent_days=recent_days,
             include_guests=include_guests
         )
-        generated_at = None
-        if os.path.exists(DISABLED_LICENSE_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(DISABLED_LICENSE_FILE)).isoformat()
+        generated_at = _report_generated_at(DISABLED_LICENSE_FILE)
 
-        return jsonify({
-            'records': filtered_records,
-            'count': len(filtered_records),
-            'generatedAt': generated_at,
-            'appliedFilters': {
+        return _stream_report_json(
+            filtered_records,
+            generatedAt=generated_at,
+            appliedFilters={
                 'licensedOnly': True,
                 'recentDays': recent_days,
                 'includeGuests': include_guests
-            }
-        })
+            },
+        )
     except Exception as e:
         logger.error(f"Error loading disabled licensed report: {e}")
         return jsonify({'error': 'Failed to load report data'}), 500
@@ -2728,18 +3101,19 @@ def get_disabled_licensed_report():
 
 @app.route('/api/reports/disabled-licensed/export')
 @require_auth
+@_cache_file_etag(DISABLED_USERS_FILE, DISABLED_LICENSE_FILE, SETTINGS_FILE)
 def export_disabled_licensed_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
 
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         all_records, base_filters = _get_disabled_records_from_request(
             force_refresh=refresh,
             apply_filters=False
         )
         recent_days = base_filters.get('recentDays')
-        include_guests = request.args.get('includeGuests', 'false').lower() == 'true'
+        include_guests = _parse_bool_arg(request.args.get('includeGuests'), default=False)
         records = apply_disabled_filters(
             all_records,
             licensed_only=True,
@@ -2747,10 +3121,6 @@ def export_disabled_licensed_report():
             include_guests=include_guests
         )
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Disabled Licensed Users"
-
         headers = [
             ('name', 'Name'),
             ('email', 'Email'),
@@ -2760,42 +3130,14 @@ def export_disabled_licensed_report():
             ('licenseSkus', 'Licenses')
         ]
 
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                value = record.get(key)
-                if key == 'licenseSkus' and isinstance(value, list):
-                    value = ", ".join(value)
-                ws.cell(row=row_index, column=column_index, value=value)
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 24
-
-        filename = f"disabled-licensed-users-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(records),
+        return _export_report_xlsx(
+            "Disabled Licensed Users",
+            headers,
+            records,
+            filename_prefix='disabled-licensed-users',
+            column_width=24,
             data_export_option=f"licensedOnly=True, includeGuests={include_guests}",
-        )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            transforms={'licenseSkus': _join_list_cell},
         )
     except Exception as e:
         logger.error(f"Error exporting disabled licensed report: {e}")
@@ -2804,6 +3146,7 @@ def export_disabled_licensed_report():
 
 @app.route('/api/reports/filtered-users')
 @require_auth
+@_cache_file_etag(FILTERED_USERS_FILE, EMPLOYEE_LIST_FILE, remember=True)
 def get_filtered_users_report():
     try:
         refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
@@ -2843,15 +3186,12 @@ def get_filtered_users_report():
         )
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
 
-        generated_at = None
-        if os.path.exists(FILTERED_USERS_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(FILTERED_USERS_FILE)).isoformat()
+        generated_at = _report_generated_at(FILTERED_USERS_FILE)
 
-        return jsonify({
-            'records': filtered_records,
-            'count': len(filtered_records),
-            'generatedAt': generated_at,
-            'appliedFilters': {
+        return _stream_report_json(
+            filtered_records,
+            generatedAt=generated_at,
+            appliedFilters={
                 'includeEnabled': include_enabled,
                 'includeDisabled': include_disabled,
                 'includeLicensed': include_licensed,
@@ -2861,8 +3201,8 @@ def get_filtered_users_report():
                 'includeUserMailboxes': include_user_mailboxes,
                 'includeSharedMailboxes': include_shared_mailboxes,
                 'includeRoomEquipmentMailboxes': include_room_equipment_mailboxes,
-            }
-        })
+            },
+        )
     except Exception as error:
         logger.error(f"Error loading filtered users report: {error}")
         return jsonify({'error': 'Failed to load report data'}), 500
@@ -2870,6 +3210,7 @@ def get_filtered_users_report():
 
 @app.route('/api/reports/filtered-users/export')
 @require_auth
+@_cache_file_etag(FILTERED_USERS_FILE, EMPLOYEE_LIST_FILE, SETTINGS_FILE)
 def export_filtered_users_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
@@ -2912,10 +3253,6 @@ def export_filtered_users_report():
         )
         filtered_records = apply_tagpicker_filters(filtered_records, **tp)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Filtered Users"
-
         headers = [
             ('name', 'Name'),
             ('email', 'Email'),
@@ -2928,47 +3265,12 @@ def export_filtered_users_report():
             ('licenseSkus', 'Licenses')
         ]
 
-        reason_labels = {
-            'filter_disabled': 'Hidden: disabled user',
-            'filter_guest': 'Hidden: guest account',
-            'filter_no_title': 'Hidden: missing title',
-            'filter_ignored_title': 'Hidden: ignored title',
-            'filter_ignored_department': 'Hidden: ignored department',
-            'filter_ignored_employee': 'Hidden: ignored user'
-        }
-
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(filtered_records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                value = record.get(key)
-                if key == 'filterReasons' and isinstance(value, list):
-                    converted = [reason_labels.get(reason, reason) for reason in value]
-                    value = ", ".join(converted)
-                elif key == 'accountEnabled':
-                    value = 'Yes' if record.get('accountEnabled', True) else 'No'
-                elif key == 'userType':
-                    user_type = (record.get('userType') or '').strip()
-                    value = user_type.capitalize() if user_type else ''
-                elif key == 'licenseSkus' and isinstance(value, list):
-                    value = ", ".join(value)
-                ws.cell(row=row_index, column=column_index, value=value)
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 26
-
-        filename = f"filtered-users-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(filtered_records),
+        return _export_report_xlsx(
+            "Filtered Users",
+            headers,
+            filtered_records,
+            filename_prefix='filtered-users',
+            column_width=26,
             data_export_option=format_export_filters(scope, {
                 'include_user_mailboxes': include_user_mailboxes,
                 'include_shared_mailboxes': include_shared_mailboxes,
@@ -2980,17 +3282,12 @@ def export_filtered_users_report():
                 'include_members': include_members,
                 'include_guests': include_guests,
             }, tp),
-        )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            transforms={
+                'filterReasons': _filter_reasons_cell,
+                'accountEnabled': _account_enabled_cell,
+                'userType': _user_type_cell,
+                'licenseSkus': _join_list_cell,
+            },
         )
     except Exception as error:
         logger.error(f"Error exporting filtered users report: {error}")
@@ -2999,19 +3296,14 @@ def export_filtered_users_report():
 
 @app.route('/api/reports/filtered-licensed')
 @require_auth
+@_cache_file_etag(FILTERED_LICENSE_FILE)
 def get_filtered_licensed_report():
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         records = load_filtered_license_data(report_cache, force_refresh=refresh)
-        generated_at = None
-        if os.path.exists(FILTERED_LICENSE_FILE):
-            generated_at = datetime.fromtimestamp(os.path.getmtime(FILTERED_LICENSE_FILE)).isoformat()
+        generated_at = _report_generated_at(FILTERED_LICENSE_FILE)
 
-        return jsonify({
-            'records': records,
-            'count': len(records),
-            'generatedAt': generated_at
-        })
+        return _stream_report_json(records, generatedAt=generated_at)
     except Exception as e:
         logger.error(f"Error loading filtered licensed report: {e}")
         return jsonify({'error': 'Failed to load report data'}), 500
@@ -3019,18 +3311,15 @@ def get_filtered_licensed_report():
 
 @app.route('/api/reports/filtered-licensed/export')
 @require_auth
+@_cache_file_etag(FILTERED_LICENSE_FILE, SETTINGS_FILE)
 def export_filtered_licensed_report():
     if not Workbook:
         return jsonify({'error': 'XLSX export not available - openpyxl not installed'}), 500
 
     try:
-        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        refresh = _parse_bool_arg(request.args.get('refresh'), default=False)
         records = load_filtered_license_data(report_cache, force_refresh=refresh)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Filtered Licensed Users"
-
         headers = [
             ('name', 'Name'),
             ('email', 'Email'),
@@ -3041,54 +3330,17 @@ def export_filtered_licensed_report():
             ('filterReasons', 'Filter Reasons')
         ]
 
-        reason_labels = {
-            'filter_disabled': 'Hidden: disabled user',
-            'filter_guest': 'Hidden: guest account',
-            'filter_no_title': 'Hidden: missing title',
-            'filter_ignored_title': 'Hidden: ignored title',
-            'filter_ignored_department': 'Hidden: ignored department',
-            'filter_ignored_employee': 'Hidden: ignored user'
-        }
-
-        for column_index, (_, header_text) in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=column_index, value=header_text)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
-
-        for row_index, record in enumerate(records, start=2):
-            for column_index, (key, _) in enumerate(headers, 1):
-                value = record.get(key)
-                if key == 'licenseSkus' and isinstance(value, list):
-                    value = ", ".join(value)
-                elif key == 'filterReasons' and isinstance(value, list):
-                    converted = [reason_labels.get(reason, reason) for reason in value]
-                    value = ", ".join(converted)
-                ws.cell(row=row_index, column=column_index, value=value)
-
-        for col in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col)
-            ws.column_dimensions[column_letter].width = 24
-
-        filename = f"filtered-licensed-users-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-
-        add_metadata_sheet(
-            wb,
-            filename=filename,
-            sheet_title=ws.title,
-            item_count=len(records),
+        return _export_report_xlsx(
+            "Filtered Licensed Users",
+            headers,
+            records,
+            filename_prefix='filtered-licensed-users',
+            column_width=24,
             data_export_option='allData',
-        )
-
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            transforms={
+                'licenseSkus': _join_list_cell,
+                'filterReasons': _filter_reasons_cell,
+            },
         )
     except Exception as e:
         logger.error(f"Error exporting filtered licensed report: {e}")
@@ -3744,52 +3996,39 @@ def _send_full_scan_email(recipient: str, scan_result: dict, xlsx_path=None):
         logger.error('Failed to email full scan results: %s', exc)
 
 @app.route('/api/search')
+@_cache_file_etag(DATA_FILE)
 def search_employees():
-    query = request.args.get('q', '').lower()
+    query = request.args.get('q', '').strip().lower()
     
     if len(query) < 2:
         return jsonify([])
     
     try:
-        if not os.path.exists(DATA_FILE):
+        # _load_employee_data stats the file itself; only probe again on a miss.
+        data = _load_employee_data()
+        if data is None and not os.path.exists(DATA_FILE):
             logger.warning(f"Data file {DATA_FILE} not found, attempting to fetch data")
             update_employee_data(source='search')
+            data = _load_employee_data()
         
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-        else:
+        if data is None:
             logger.error("Could not create or find employee data file")
             return jsonify([])
         
-        def flatten(node, results=None):
-            if results is None:
-                results = []
-            if node and isinstance(node, dict):
-                results.append(node)
-                children = node.get('children', [])
-                if children and isinstance(children, list):
-                    for child in children:
-                        flatten(child, results)
-            return results
-        
-        all_employees = flatten(data)
+        all_employees, lowered_fields = _get_hierarchy_index(data)
+        candidate_indexes = _search_candidate_indexes(data, lowered_fields, query)
+        if candidate_indexes is None:
+            candidate_indexes = range(len(all_employees))
         
         results = []
-        for emp in all_employees:
-            if emp and isinstance(emp, dict):
-                name = emp.get('name') or ''
-                title = emp.get('title') or ''
-                department = emp.get('department') or ''
-                
-                name_match = query in name.lower()
-                title_match = query in title.lower()
-                dept_match = query in department.lower()
-                
-                if name_match or title_match or dept_match:
-                    results.append(emp)
+        for index in candidate_indexes:
+            name, title, department = lowered_fields[index]
+            if query in name or query in title or query in department:
+                results.append(all_employees[index])
+                if len(results) == 10:
+                    break
         
-        return jsonify(results[:10])
+        return jsonify(results)
     except FileNotFoundError as e:
         logger.error(f"File not found in search: {e}")
         return jsonify([])
@@ -3816,19 +4055,8 @@ def search_employees():
 @app.route('/api/employee/<employee_id>')
 def get_employee(employee_id):
     try:
-        with open(DATA_FILE, 'r') as f:
-            data = json.load(f)
-        
-        def find_employee(node, target_id):
-            if node.get('id') == target_id:
-                return node
-            for child in node.get('children', []):
-                result = find_employee(child, target_id)
-                if result:
-                    return result
-            return None
-        
-        employee = find_employee(data, employee_id)
+        data = _load_employee_data()
+        employee = _find_employee_node(data, employee_id) if data else None
 
         if employee:
             return jsonify(employee)
@@ -3845,15 +4073,9 @@ def get_employee(employee_id):
 def trigger_update():
     try:
         current_status = load_data_update_status()
-        if current_status.get('state') == 'running':
+        if current_status.get('state') == 'running' or not _start_manual_update():
             return jsonify({'error': 'Update already in progress'}), 409
 
-        worker = threading.Thread(
-            target=update_employee_data,
-            kwargs={'source': 'manual'},
-            daemon=True,
-        )
-        worker.start()
         logger.info(f"Manual update triggered by user: {session.get('username')}")
         return jsonify({'message': 'Update started'}), 200
     except Exception as e:
@@ -3867,7 +4089,7 @@ def trigger_update():
 def clear_cached_data():
     """Delete all cached dataset files (keeping settings/config) and trigger a fresh sync."""
     current_status = load_data_update_status()
-    if current_status.get('state') == 'running':
+    if current_status.get('state') == 'running' or _manual_update_lock.locked():
         return jsonify({'error': 'Update already in progress'}), 409
 
     cache_files = [
@@ -3902,12 +4124,8 @@ def clear_cached_data():
     )
 
     try:
-        worker = threading.Thread(
-            target=update_employee_data,
-            kwargs={'source': 'manual'},
-            daemon=True,
-        )
-        worker.start()
+        if not _start_manual_update():
+            return jsonify({'cleared': removed, 'error': 'Update already in progress'}), 409
     except Exception as e:
         logger.error(f"Error triggering update after clearing data: {e}")
         mark_data_update_finished(success=False, error=str(e), source='manual')
@@ -3923,45 +4141,34 @@ def search_test():
 def debug_search():
     """Debug endpoint to check search functionality"""
     try:
+        try:
+            data_file_stat = os.stat(DATA_FILE)
+        except OSError:
+            data_file_stat = None
         info = {
-            'data_file_exists': os.path.exists(DATA_FILE),
-            'data_file_path': os.path.abspath(DATA_FILE) if os.path.exists(DATA_FILE) else 'Not found',
-            'data_file_size': os.path.getsize(DATA_FILE) if os.path.exists(DATA_FILE) else 0,
+            'data_file_exists': data_file_stat is not None,
+            'data_file_path': os.path.abspath(DATA_FILE) if data_file_stat else 'Not found',
+            'data_file_size': data_file_stat.st_size if data_file_stat else 0,
         }
         
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-                
-                def count_employees(node):
-                    count = 1
-                    for child in node.get('children', []):
-                        count += count_employees(child)
-                    return count
-                
-                info['total_employees'] = count_employees(data) if data else 0
-                info['root_employee'] = data.get('name', 'Unknown') if data else 'No data'
-                info['has_children'] = bool(data.get('children')) if data else False
-                
-                def flatten(node, results=None):
-                    if results is None:
-                        results = []
-                    if node and isinstance(node, dict):
-                        results.append({
-                            'id': node.get('id'),
-                            'name': node.get('name'),
-                            'title': node.get('title'),
-                            'department': node.get('department')
-                        })
-                        children = node.get('children', [])
-                        if children and isinstance(children, list):
-                            for child in children:
-                                flatten(child, results)
-                    return results
-                
-                all_employees = flatten(data)
-                info['sample_employees'] = all_employees[:5] if all_employees else []
-                info['searchable_count'] = len(all_employees)
+        if data_file_stat is not None:
+            data = _load_employee_data()
+            all_employees, _ = _get_hierarchy_index(data) if data else ([], [])
+            
+            info['total_employees'] = len(all_employees)
+            info['root_employee'] = data.get('name', 'Unknown') if data else 'No data'
+            info['has_children'] = bool(data.get('children')) if data else False
+            
+            info['sample_employees'] = [
+                {
+                    'id': node.get('id'),
+                    'name': node.get('name'),
+                    'title': node.get('title'),
+                    'department': node.get('department')
+                }
+                for node in all_employees[:5]
+            ]
+            info['searchable_count'] = len(all_employees)
         else:
             info['error'] = 'Data file does not exist. Try triggering an update.'
             
@@ -3986,18 +4193,8 @@ def force_update():
         update_employee_data(source='force-update')
         
         if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-                
-            def count_employees(node):
-                if not node:
-                    return 0
-                count = 1
-                for child in node.get('children', []):
-                    count += count_employees(child)
-                return count
-                
-            total = count_employees(data)
+            data = _load_employee_data()
+            total = len(_get_hierarchy_index(data)[0]) if data else 0
             return jsonify({
                 'success': True,
                 'message': f'Data updated successfully. {total} employees in hierarchy.',
@@ -16,6 +16,7 @@ STATIC_DIR = BASE_DIR / "static"
 TEMPLATE_DIR = BASE_DIR / "templates"
 
 REPO_DIR = DATA_DIR / "repositories"
+PHOTOS_DIR = DATA_DIR / "photos"
 SETTINGS_FILE = CONFIG_DIR / "app_settings.json"
 DATA_FILE = DATA_DIR / "employee_data.json"
 MISSING_MANAGER_FILE = DATA_DIR / "missing_manager_records.json"
@@ -31,11 +32,12 @@ MISSING_PHOTO_FILE = DATA_DIR / "missing_photo_records.json"
 GRAPH_CAPABILITIES_FILE = DATA_DIR / "graph_capabilities.json"
 DIRTY_DATA_FILE = DATA_DIR / "dirty_data_records.json"
 MISSING_HIRE_DATE_FILE = DATA_DIR / "missing_hire_date_records.json"
+SECRET_KEY_FILE = DATA_DIR / ".secret_key"
 
 
 def ensure_directories() -> None:
-    """Ensure that the application's data, config, static, and repo directories exist."""
-    for target in (DATA_DIR, CONFIG_DIR, STATIC_DIR, REPO_DIR):
+    """Ensure that the application's data, config, static, repo, and photo directories exist."""
+    for target in (DATA_DIR, CONFIG_DIR, STATIC_DIR, REPO_DIR, PHOTOS_DIR):
         try:
             target.mkdir(parents=True, exist_ok=True)
         except OSError as error:
@@ -54,6 +56,7 @@ __all__ = [
     "STATIC_DIR",
     "TEMPLATE_DIR",
     "REPO_DIR",
+    "PHOTOS_DIR",
     "SETTINGS_FILE",
     "DATA_FILE",
     "MISSING_MANAGER_FILE",
@@ -69,6 +72,7 @@ __all__ = [
     "GRAPH_CAPABILITIES_FILE",
     "DIRTY_DATA_FILE",
     "MISSING_HIRE_DATE_FILE",
+    "SECRET_KEY_FILE",
     "ensure_directories",
     "as_posix_env",
 ]
@@ -6,7 +6,9 @@ import json
 import logging
 import os
 import threading
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
 from typing import Any, Callable, Dict, List, Optional
 
 import simple_org_chart.config as app_config
@@ -32,7 +34,9 @@ from simple_org_chart.settings import (
 from simple_org_chart.hierarchy import (
     build_org_hierarchy,
     collect_missing_manager_records,
+    mark_new_employees,
 )
+from simple_org_chart.utils.files import write_bytes_atomic, write_json_atomic
 
 logger = logging.getLogger(__name__)
 
@@ -54,17 +58,43 @@ MISSING_HIRE_DATE_FILE = str(app_config.MISSING_HIRE_DATE_FILE)
 DATA_UPDATE_STATUS_FILE = os.path.join(DATA_DIR, 'data_update_status.json')
 
 _DATA_UPDATE_STATUS_LOCK = threading.Lock()
+_DATA_UPDATE_STATUS_WRITE_LOCK = threading.Lock()
 _CURRENT_DATA_UPDATE_STATUS: Dict[str, Any] = {'state': 'idle'}
+# (mtime_ns, size) of the status file when _CURRENT_DATA_UPDATE_STATUS last
+# matched it. Other workers write the same file, so it is still the source of
+# truth, but it is only re-parsed when this signature changes.
+_DATA_UPDATE_STATUS_SIGNATURE: Optional[tuple] = None
 _APP_STARTUP_COMPLETE = False
 
 
+def _file_signature(path: str) -> Optional[tuple]:
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def _status_file_signature() -> Optional[tuple]:
+    return _file_signature(DATA_UPDATE_STATUS_FILE)
+
+
 def _write_data_update_status(payload: Dict[str, Any]) -> Dict[str, Any]:
-    global _CURRENT_DATA_UPDATE_STATUS
+    global _CURRENT_DATA_UPDATE_STATUS, _DATA_UPDATE_STATUS_SIGNATURE
     with _DATA_UPDATE_STATUS_LOCK:
         _CURRENT_DATA_UPDATE_STATUS = payload
+
+    # Status readers only wait for the in-memory swap above. Writers take
+    # turns on the file and each publishes the latest status, so a slower
+    # writer can never leave an older payload on disk.
+    with _DATA_UPDATE_STATUS_WRITE_LOCK:
+        with _DATA_UPDATE_STATUS_LOCK:
+            latest = dict(_CURRENT_DATA_UPDATE_STATUS)
         try:
-            with open(DATA_UPDATE_STATUS_FILE, 'w') as status_file:
-                json.dump(payload, status_file, indent=2)
+            write_json_atomic(DATA_UPDATE_STATUS_FILE, latest, indent=2)
+            signature = _status_file_signature()
+            with _DATA_UPDATE_STATUS_LOCK:
+                _DATA_UPDATE_STATUS_SIGNATURE = signature
         except Exception as error:
             logger.warning("Failed to write data update status: %s", error)
     return payload
@@ -72,15 +102,17 @@ def _write_data_update_status(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 def load_data_update_status() -> Dict[str, Any]:
     """Load data update status from disk, resetting stale running states."""
-    global _CURRENT_DATA_UPDATE_STATUS, _APP_STARTUP_COMPLETE
+    global _CURRENT_DATA_UPDATE_STATUS, _DATA_UPDATE_STATUS_SIGNATURE
     stale_override = None
     with _DATA_UPDATE_STATUS_LOCK:
-        if os.path.exists(DATA_UPDATE_STATUS_FILE):
+        signature = _status_file_signature()
+        if signature is not None and signature != _DATA_UPDATE_STATUS_SIGNATURE:
             try:
                 with open(DATA_UPDATE_STATUS_FILE, 'r') as status_file:
                     data = json.load(status_file)
                 if isinstance(data, dict):
                     _CURRENT_DATA_UPDATE_STATUS = data
+                    _DATA_UPDATE_STATUS_SIGNATURE = signature
             except Exception as error:
                 logger.warning("Failed to load data update status: %s", error)
 
@@ -179,15 +211,37 @@ def mark_startup_complete() -> None:
     _APP_STARTUP_COMPLETE = True
 
 
+def _iso_date_text_before(value: object, cutoff_date_text: str) -> bool:
+    """True when ``value`` is an ISO timestamp whose date part sorts before ``cutoff_date_text``.
+
+    Lets the recent-window filters skip clearly old records without building
+    a datetime; anything that is not ``YYYY-MM-DD...`` text returns False.
+    """
+    return (
+        isinstance(value, str)
+        and len(value) >= 10
+        and value[4] == '-'
+        and value[7] == '-'
+        and value[:10] < cutoff_date_text
+    )
+
+
 def collect_recently_disabled_employees(
     records: List[Dict[str, Any]],
     days: int = 365,
+    *,
+    now: Optional[datetime] = None,
 ) -> List[Dict[str, Any]]:
-    """Filter disabled user records to those disabled within the last N days."""
+    """Filter disabled user records to those disabled within the last N days.
+
+    ``now`` (timezone-aware) lets a refresh share one clock reading.
+    """
     if not records:
         return []
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    # One day of slack so UTC offsets on the timestamps cannot matter.
+    cutoff_date_text = (cutoff - timedelta(days=1)).date().isoformat()
     recent = []
 
     for record in records:
@@ -195,6 +249,8 @@ def collect_recently_disabled_employees(
             record.get('firstSeenDisabledAt')
             or record.get('disabledDate')
         )
+        if _iso_date_text_before(observed_value, cutoff_date_text):
+            continue
         disabled_at = parse_graph_datetime(observed_value)
         if not disabled_at or disabled_at < cutoff:
             continue
@@ -213,17 +269,26 @@ def collect_recently_disabled_employees(
 def collect_recently_hired_employees(
     employees: List[Dict[str, Any]],
     days: int = 365,
+    *,
+    now: Optional[datetime] = None,
 ) -> List[Dict[str, Any]]:
-    """Filter employees to those hired within the last N days."""
+    """Filter employees to those hired within the last N days.
+
+    ``now`` (timezone-aware) lets a refresh share one clock reading.
+    """
     if not employees:
         return []
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=days)
+    cutoff_date_text = (cutoff - timedelta(days=1)).date().isoformat()
     manager_lookup = {emp.get('id'): emp for emp in employees if emp.get('id')}
     recent = []
 
     for employee in employees:
-        hire_date = parse_graph_datetime(employee.get('hireDate') or employee.get('employeeHireDate'))
+        hire_value = employee.get('hireDate') or employee.get('employeeHireDate')
+        if _iso_date_text_before(hire_value, cutoff_date_text):
+            continue
+        hire_date = parse_graph_datetime(hire_value)
         if not hire_date or hire_date < cutoff:
             continue
 
@@ -282,6 +347,97 @@ def _load_fetch_all_employees_fallback() -> tuple:
     return cached_employees, cached_filtered_with_license, cached_filtered_users
 
 
+def _write_cache_bytes(path: str, data: bytes, label: str, required: bool) -> Optional[tuple]:
+    try:
+        write_bytes_atomic(path, data)
+    except Exception as error:
+        logger.error(f"Failed to write {label}: {error}")
+        if required:
+            raise
+        return None
+    logger.info(f"Updated {label}")
+    return _file_signature(path)
+
+
+def _submit_cache_write(
+    executor: ThreadPoolExecutor,
+    path: str,
+    payload: Any,
+    label: str,
+    *,
+    required: bool = False,
+) -> Future:
+    """Encode ``payload`` now and atomically write it to ``path`` on ``executor``.
+
+    Encoding up front means later in-place changes to ``payload`` cannot race
+    the write. Failures are logged; with ``required`` the returned future also
+    raises them. On success the future holds the written file's signature.
+    """
+    data = json.dumps(payload).encode('utf-8')
+    return executor.submit(_write_cache_bytes, path, data, label, required)
+
+
+# (file signature, records) of the disabled users cache as this process last
+# read or wrote it. The previous records are only needed to carry
+# firstSeenDisabledAt forward, so each refresh reuses them instead of parsing
+# the file again unless another worker or a cache clear has changed it.
+_PREVIOUS_DISABLED_RECORDS: Optional[tuple] = None
+
+
+def _load_previous_disabled_records() -> List[Dict[str, Any]]:
+    global _PREVIOUS_DISABLED_RECORDS
+    signature = _file_signature(DISABLED_USERS_FILE)
+    if signature is None:
+        _PREVIOUS_DISABLED_RECORDS = None
+        return []
+
+    cached = _PREVIOUS_DISABLED_RECORDS
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    try:
+        with open(DISABLED_USERS_FILE, 'r') as previous_file:
+            data = json.load(previous_file)
+    except Exception as previous_error:
+        logger.warning(f"Unable to load existing disabled users cache: {previous_error}")
+        return []
+    if not isinstance(data, list):
+        return []
+
+    _PREVIOUS_DISABLED_RECORDS = (signature, data)
+    return data
+
+
+def _remember_disabled_records(records: List[Dict[str, Any]], write: Future) -> None:
+    global _PREVIOUS_DISABLED_RECORDS
+    signature = None if write.cancelled() or write.exception() else write.result()
+    if signature is not None:
+        _PREVIOUS_DISABLED_RECORDS = (signature, records)
+
+
+_DATA_DIR_WRITABLE = False
+
+
+def _probe_data_dir_writable() -> Optional[Exception]:
+    """Return the error from a test write into DATA_DIR, or None when it works.
+
+    Only a successful probe is remembered, so a directory that was not yet
+    writable (for example a volume mounted late) is checked again next time.
+    """
+    global _DATA_DIR_WRITABLE
+    if _DATA_DIR_WRITABLE:
+        return None
+    test_file = os.path.join(DATA_DIR, 'test_write.tmp')
+    try:
+        with open(test_file, 'w') as f:
+            f.write('test')
+        os.remove(test_file)
+    except Exception as e:
+        return e
+    _DATA_DIR_WRITABLE = True
+    return None
+
+
 def update_employee_data(source: str = 'unknown') -> None:
     """Refresh all employee data from Microsoft Graph API."""
     success = False
@@ -295,24 +451,25 @@ def update_employee_data(source: str = 'unknown') -> None:
         )
         return
     mark_data_update_running(source=source)
+    # Payloads are encoded on this thread and only the file writes go to this
+    # pool, so they overlap the Graph calls that produce the next report.
+    cache_writes = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache-write')
+    required_writes: List[Future] = []
     try:
         # Ensure data directory exists and is writable
         if not os.path.exists(DATA_DIR):
             os.makedirs(DATA_DIR, exist_ok=True)
             logger.info(f"Created data directory: {DATA_DIR}")
 
-        # Test if we can write to the data directory
-        test_file = os.path.join(DATA_DIR, 'test_write.tmp')
-        try:
-            with open(test_file, 'w') as f:
-                f.write('test')
-            os.remove(test_file)
-        except Exception as e:
-            logger.error(f"Cannot write to data directory {DATA_DIR}: {e}")
-            error_message = f"Cannot write to data directory {DATA_DIR}: {e}"
+        write_error = _probe_data_dir_writable()
+        if write_error:
+            logger.error(f"Cannot write to data directory {DATA_DIR}: {write_error}")
+            error_message = f"Cannot write to data directory {DATA_DIR}: {write_error}"
             return
 
         logger.info("Starting employee data update...")
+        # One clock reading for every recency window computed in this refresh.
+        now_utc = datetime.now(timezone.utc)
 
         token = get_access_token()
         if not token:
@@ -342,8 +499,9 @@ def update_employee_data(source: str = 'unknown') -> None:
             # Check photos on ALL users (employees + filtered_users) so the
             # "All" scope can show every user without a photo, regardless of
             # org-chart visibility filters applied by fetch_all_employees.
+            # The same combined list feeds every all-users report below.
+            all_users = list(employees) + (filtered_users or [])
             try:
-                all_users = list(employees) + (filtered_users or [])
                 all_ids = [emp.get('id') for emp in all_users if emp.get('id')]
                 has_photo_ids = batch_check_photos(all_ids, token)
                 missing_photo_records = []
@@ -366,10 +524,11 @@ def update_employee_data(source: str = 'unknown') -> None:
                             'mailboxType': emp.get('mailboxType'),
                             'isSharedMailbox': emp.get('isSharedMailbox'),
                         })
-                with open(MISSING_PHOTO_FILE, 'w') as report_file:
-                    json.dump(missing_photo_records, report_file, indent=2)
-                logger.info(
-                    f"Updated missing photo report cache with {len(missing_photo_records)} records"
+                _submit_cache_write(
+                    cache_writes,
+                    MISSING_PHOTO_FILE,
+                    missing_photo_records,
+                    f"missing photo report cache with {len(missing_photo_records)} records",
                 )
             except Exception as report_error:
                 logger.error(f"Failed to write missing photo report cache: {report_error}")
@@ -397,25 +556,26 @@ def update_employee_data(source: str = 'unknown') -> None:
                         'hasMailbox': emp.get('hasMailbox', True),
                         'hiddenFromAddressLists': emp.get('hiddenFromAddressLists', False),
                     }
-                    for emp in (list(employees) + (filtered_users or []))
+                    for emp in all_users
                     if not (emp.get('hireDate') or emp.get('employeeHireDate'))
                 ]
-                with open(MISSING_HIRE_DATE_FILE, 'w') as report_file:
-                    json.dump(missing_hire_date_records, report_file, indent=2)
-                logger.info(
-                    f"Updated missing hire date report cache with {len(missing_hire_date_records)} records"
+                _submit_cache_write(
+                    cache_writes,
+                    MISSING_HIRE_DATE_FILE,
+                    missing_hire_date_records,
+                    f"missing hire date report cache with {len(missing_hire_date_records)} records",
                 )
             except Exception as report_error:
                 logger.error(f"Failed to write missing hire date report cache: {report_error}")
 
             try:
                 from simple_org_chart.reports import detect_dirty_data_records
-                all_users_for_dirty = list(employees) + (filtered_users or [])
-                dirty_records = detect_dirty_data_records(all_users_for_dirty)
-                with open(DIRTY_DATA_FILE, 'w') as report_file:
-                    json.dump(dirty_records, report_file, indent=2)
-                logger.info(
-                    f"Updated dirty data report cache with {len(dirty_records)} records"
+                dirty_records = detect_dirty_data_records(all_users)
+                _submit_cache_write(
+                    cache_writes,
+                    DIRTY_DATA_FILE,
+                    dirty_records,
+                    f"dirty data report cache with {len(dirty_records)} records",
                 )
             except Exception as report_error:
                 logger.error(f"Failed to write dirty data report cache: {report_error}")
@@ -425,44 +585,55 @@ def update_employee_data(source: str = 'unknown') -> None:
 
             # Collect recently hired from ALL users (before ignore filtering)
             try:
-                all_users_for_hired = list(employees) + (filtered_users or [])
-                recently_hired_records = collect_recently_hired_employees(all_users_for_hired, days=365)
-                with open(RECENTLY_HIRED_FILE, 'w') as report_file:
-                    json.dump(recently_hired_records, report_file, indent=2)
-                logger.info(
-                    f"Updated recently hired employees report cache with {len(recently_hired_records)} records"
+                recently_hired_records = collect_recently_hired_employees(all_users, days=365, now=now_utc)
+                _submit_cache_write(
+                    cache_writes,
+                    RECENTLY_HIRED_FILE,
+                    recently_hired_records,
+                    f"recently hired employees report cache with {len(recently_hired_records)} records",
                 )
             except Exception as report_error:
                 logger.error(f"Failed to write recently hired employees report cache: {report_error}")
 
-            if ignored_employee_set:
+            if ignored_employee_set or ignored_department_set:
+                # One pass for both ignore lists; the counts keep the
+                # per-list log lines the separate passes used to emit.
                 before = len(employees)
-                employees = [
-                    emp for emp in employees
-                    if not employee_is_ignored(
+                ignored_employees = ignored_departments = 0
+                kept = []
+                for emp in employees:
+                    if ignored_employee_set and employee_is_ignored(
                         emp.get('name'),
                         emp.get('email'),
                         emp.get('userPrincipalName'),
                         ignored_employee_set
-                    )
-                ]
-                if before != len(employees):
-                    logger.info(f"Filtered ignored employees; {before}->{len(employees)} remaining")
+                    ):
+                        ignored_employees += 1
+                    elif ignored_department_set and department_is_ignored(
+                        emp.get('department'), ignored_department_set
+                    ):
+                        ignored_departments += 1
+                    else:
+                        kept.append(emp)
+                employees = kept
 
-            if ignored_department_set:
-                before = len(employees)
-                employees = [
-                    emp for emp in employees
-                    if not department_is_ignored(emp.get('department'), ignored_department_set)
-                ]
-                logger.info(
-                    f"Filtered ignored departments {sorted(list(ignored_department_set))}; {before}->{len(employees)} employees"
-                )
+                if ignored_employees:
+                    logger.info(
+                        f"Filtered ignored employees; {before}->{before - ignored_employees} remaining"
+                    )
+                if ignored_department_set:
+                    logger.info(
+                        f"Filtered ignored departments {sorted(list(ignored_department_set))}; "
+                        f"{before - ignored_employees}->{len(employees)} employees"
+                    )
 
             try:
-                with open(EMPLOYEE_LIST_FILE, 'w') as employee_cache:
-                    json.dump(employees, employee_cache, indent=2)
-                logger.info(f"Cached {len(employees)} employees for session-specific hierarchy builds")
+                _submit_cache_write(
+                    cache_writes,
+                    EMPLOYEE_LIST_FILE,
+                    employees,
+                    f"employee list cache with {len(employees)} employees for session-specific hierarchy builds",
+                )
             except Exception as cache_error:
                 logger.error(f"Failed to write employee cache: {cache_error}")
 
@@ -498,33 +669,24 @@ def update_employee_data(source: str = 'unknown') -> None:
                 _enrich_mailbox_metadata(enrichment_headers, missing_records, max_lookups=0)
 
             if hierarchy:
-                def update_new_status(node):
-                    if node.get('hireDate'):
-                        try:
-                            hire_date = datetime.fromisoformat(node['hireDate'])
-                            if hire_date.tzinfo:
-                                cutoff_date = datetime.now(hire_date.tzinfo) - timedelta(days=months_threshold * 30)
-                            else:
-                                cutoff_date = datetime.now() - timedelta(days=months_threshold * 30)
-                            node['isNewEmployee'] = hire_date > cutoff_date
-                        except Exception:
-                            node['isNewEmployee'] = False
-                    else:
-                        node['isNewEmployee'] = False
+                mark_new_employees(hierarchy, months_threshold, now=now_utc)
 
-                    for child in node.get('children', []) or []:
-                        update_new_status(child)
-
-                update_new_status(hierarchy)
-
-                with open(DATA_FILE, 'w') as f:
-                    json.dump(hierarchy, f, indent=2)
-                logger.info(f"Successfully updated employee data. Total employees: {len(employees)}")
+                # The refresh fails if the hierarchy itself cannot be written.
+                required_writes.append(_submit_cache_write(
+                    cache_writes,
+                    DATA_FILE,
+                    hierarchy,
+                    f"employee data. Total employees: {len(employees)}",
+                    required=True,
+                ))
 
                 try:
-                    with open(MISSING_MANAGER_FILE, 'w') as report_file:
-                        json.dump(missing_records, report_file, indent=2)
-                    logger.info(f"Updated missing manager report cache with {len(missing_records)} records")
+                    _submit_cache_write(
+                        cache_writes,
+                        MISSING_MANAGER_FILE,
+                        missing_records,
+                        f"missing manager report cache with {len(missing_records)} records",
+                    )
                 except Exception as report_error:
                     logger.error(f"Failed to write missing manager report cache: {report_error}")
             else:
@@ -535,20 +697,22 @@ def update_employee_data(source: str = 'unknown') -> None:
 
         try:
             filtered_user_records = filtered_users or []
-            with open(FILTERED_USERS_FILE, 'w') as report_file:
-                json.dump(filtered_user_records, report_file, indent=2)
-            logger.info(
-                f"Updated filtered users report cache with {len(filtered_user_records)} records"
+            _submit_cache_write(
+                cache_writes,
+                FILTERED_USERS_FILE,
+                filtered_user_records,
+                f"filtered users report cache with {len(filtered_user_records)} records",
             )
         except Exception as report_error:
             logger.error(f"Failed to write filtered users report cache: {report_error}")
 
         try:
             filtered_license_records = filtered_with_license or []
-            with open(FILTERED_LICENSE_FILE, 'w') as report_file:
-                json.dump(filtered_license_records, report_file, indent=2)
-            logger.info(
-                f"Updated filtered licensed users report cache with {len(filtered_license_records)} records"
+            _submit_cache_write(
+                cache_writes,
+                FILTERED_LICENSE_FILE,
+                filtered_license_records,
+                f"filtered licensed users report cache with {len(filtered_license_records)} records",
             )
         except Exception as report_error:
             logger.error(f"Failed to write filtered licensed users report cache: {report_error}")
@@ -566,34 +730,29 @@ def update_employee_data(source: str = 'unknown') -> None:
                 else:
                     _rec.setdefault('managerId', None)
                     _rec.setdefault('hasManager', False)
-            with open(LAST_LOGIN_FILE, 'w') as report_file:
-                json.dump(last_login_records, report_file, indent=2)
-            logger.info(
-                f"Updated last sign-in report cache with {len(last_login_records)} records"
+            _submit_cache_write(
+                cache_writes,
+                LAST_LOGIN_FILE,
+                last_login_records,
+                f"last sign-in report cache with {len(last_login_records)} records",
             )
         except Exception as report_error:
             logger.error(f"Failed to write last sign-in report cache: {report_error}")
 
         try:
-            existing_disabled_records = []
-            if os.path.exists(DISABLED_USERS_FILE):
-                try:
-                    with open(DISABLED_USERS_FILE, 'r') as previous_file:
-                        data = json.load(previous_file)
-                        if isinstance(data, list):
-                            existing_disabled_records = data
-                except Exception as previous_error:
-                    logger.warning(f"Unable to load existing disabled users cache: {previous_error}")
+            existing_disabled_records = _load_previous_disabled_records()
 
             disabled_user_records = collect_disabled_users(
                 token=token,
                 previous_records=existing_disabled_records
             ) or []
-            with open(DISABLED_USERS_FILE, 'w') as report_file:
-                json.dump(disabled_user_records, report_file, indent=2)
-            logger.info(
-                f"Updated disabled users report cache with {len(disabled_user_records)} records"
+            disabled_write = _submit_cache_write(
+                cache_writes,
+                DISABLED_USERS_FILE,
+                disabled_user_records,
+                f"disabled users report cache with {len(disabled_user_records)} records",
             )
+            disabled_write.add_done_callback(partial(_remember_disabled_records, disabled_user_records))
         except Exception as report_error:
             logger.error(f"Failed to write disabled users report cache: {report_error}")
 
@@ -602,28 +761,35 @@ def update_employee_data(source: str = 'unknown') -> None:
                 record for record in disabled_user_records if (record.get('licenseCount') or 0) > 0
             ]
 
-            with open(DISABLED_LICENSE_FILE, 'w') as report_file:
-                json.dump(disabled_license_records, report_file, indent=2)
-            logger.info(
-                f"Updated disabled licensed users report cache with {len(disabled_license_records)} records"
+            _submit_cache_write(
+                cache_writes,
+                DISABLED_LICENSE_FILE,
+                disabled_license_records,
+                f"disabled licensed users report cache with {len(disabled_license_records)} records",
             )
         except Exception as report_error:
             logger.error(f"Failed to write disabled licensed users report cache: {report_error}")
 
         try:
-            recently_disabled_records = collect_recently_disabled_employees(disabled_user_records, days=365)
-            with open(RECENTLY_DISABLED_FILE, 'w') as report_file:
-                json.dump(recently_disabled_records, report_file, indent=2)
-            logger.info(
-                f"Updated recently disabled employees report cache with {len(recently_disabled_records)} records"
+            recently_disabled_records = collect_recently_disabled_employees(
+                disabled_user_records, days=365, now=now_utc
+            )
+            _submit_cache_write(
+                cache_writes,
+                RECENTLY_DISABLED_FILE,
+                recently_disabled_records,
+                f"recently disabled employees report cache with {len(recently_disabled_records)} records",
             )
         except Exception as report_error:
             logger.error(f"Failed to write recently disabled employees report cache: {report_error}")
+        for pending_write in required_writes:
+            pending_write.result()
         success = True
     except Exception as e:
         error_message = str(e)
         logger.error(f"Error updating employee data: {e}")
     finally:
+        cache_writes.shutdown(wait=True)
         if success:
             mark_data_update_finished(success=True, source=source)
             logger.info(f"Data sync completed successfully (source: {source})")
@@ -713,6 +879,7 @@ def _generate_xlsx_bytes() -> bytes:
     from io import BytesIO
     try:
         from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
         from openpyxl.styles import Font, PatternFill, Alignment
         from openpyxl.utils import get_column_letter
     except ImportError:
@@ -728,42 +895,41 @@ def _generate_xlsx_bytes() -> bytes:
     if not employees:
         raise ValueError("No employee data available for export")
     
-    # Create workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Employees"
+    # Create a streaming workbook; column widths must precede the rows
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Employees")
     
     # Define columns (simplified version, full admin export)
     headers = [
         'Name', 'Title', 'Department', 'Email', 'Phone', 
         'Manager', 'Office', 'City', 'State', 'Country'
     ]
+    fields = [
+        'name', 'title', 'department', 'email', 'phone',
+        'managerName', 'officeLocation', 'city', 'state', 'country'
+    ]
+    
+    for col in range(1, len(headers) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = 20
     
     # Write headers
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center")
+    header_font = Font(bold=True)
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_alignment = Alignment(horizontal="center")
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
     
     # Write data
-    for row_idx, emp in enumerate(employees, 2):
-        ws.cell(row=row_idx, column=1, value=emp.get('name', ''))
-        ws.cell(row=row_idx, column=2, value=emp.get('title', ''))
-        ws.cell(row=row_idx, column=3, value=emp.get('department', ''))
-        ws.cell(row=row_idx, column=4, value=emp.get('email', ''))
-        ws.cell(row=row_idx, column=5, value=emp.get('phone', ''))
-        ws.cell(row=row_idx, column=6, value=emp.get('managerName', ''))
-        ws.cell(row=row_idx, column=7, value=emp.get('officeLocation', ''))
-        ws.cell(row=row_idx, column=8, value=emp.get('city', ''))
-        ws.cell(row=row_idx, column=9, value=emp.get('state', ''))
-        ws.cell(row=row_idx, column=10, value=emp.get('country', ''))
-    
-    # Auto-adjust column widths
-    for col in range(1, len(headers) + 1):
-        ws.column_dimensions[get_column_letter(col)].width = 20
+    for emp in employees:
+        ws.append([emp.get(field, '') for field in fields])
     
-    filename = f"org-chart-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
+    filename = f"org-chart-{date.today().isoformat()}.xlsx"
 
     from simple_org_chart.exports import add_metadata_sheet
     add_metadata_sheet(
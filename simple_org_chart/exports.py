@@ -5,7 +5,8 @@ from __future__ import annotations
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,14 @@ def format_hire_date(date_string: Optional[str]) -> str:
     """Format an ISO date string to a readable format."""
     if not date_string:
         return ''
+    if not isinstance(date_string, str):
+        return date_string
+    return _format_iso_date_text(date_string)
+
+
+@lru_cache(maxsize=4096)
+def _format_iso_date_text(date_string: str) -> str:
+    # Exports format the same cached hire dates on every download.
     try:
         dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
         return dt.strftime('%Y-%m-%d')
@@ -55,14 +64,31 @@ def add_metadata_sheet(
 
     Mirrors the layout used by Microsoft Purview DSPM exports.
     """
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, Alignment
     from openpyxl.drawing.image import Image as XlImage
 
+    # Rows are appended rather than addressed by coordinate so this works for
+    # both regular and ``write_only`` workbooks; dimensions go first because
+    # write-only sheets cannot be changed once rows have been streamed.
     ws = wb.create_sheet(title='Metadata')
+    ws.column_dimensions['A'].width = 22
+    ws.column_dimensions['B'].width = 40
+    ws.row_dimensions[1].height = 30
+    ws.row_dimensions[2].height = 30
+    ws.row_dimensions[3].height = 30
 
     label_font = Font(bold=True)
-    title_font = Font(bold=True, size=14)
     value_alignment = Alignment(horizontal='left')
+    heading_alignment = Alignment(vertical='center')
+
+    def styled(value, font=None, alignment=None):
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if alignment is not None:
+            cell.alignment = alignment
+        return cell
 
     # Logo image in A1 (if available)
     logo_path = _resolve_logo_path()
@@ -76,17 +102,10 @@ def add_metadata_sheet(
             logo_col_offset = 1
 
     # Title text next to logo
-    ws.row_dimensions[1].height = 30
-    ws.row_dimensions[2].height = 30
-    ws.row_dimensions[3].height = 30
-
-    title_cell = ws.cell(row=1, column=logo_col_offset, value='Simple Org Chart')
-    title_cell.font = title_font
-    title_cell.alignment = Alignment(vertical='center')
-
-    subtitle_cell = ws.cell(row=2, column=logo_col_offset, value='Export Report')
-    subtitle_cell.font = Font(bold=True, size=12)
-    subtitle_cell.alignment = Alignment(vertical='center')
+    padding = [None] * (logo_col_offset - 1)
+    ws.append(padding + [styled('Simple Org Chart', Font(bold=True, size=14), heading_alignment)])
+    ws.append(padding + [styled('Export Report', Font(bold=True, size=12), heading_alignment)])
+    ws.append([])
 
     # Metadata rows start at row 4
     rows = [
@@ -100,14 +119,44 @@ def add_metadata_sheet(
     if exported_by:
         rows.append(('Exported by', exported_by))
 
-    for idx, (label, value) in enumerate(rows, start=4):
-        label_cell = ws.cell(row=idx, column=1, value=label)
-        label_cell.font = label_font
-        value_cell = ws.cell(row=idx, column=2, value=value)
-        value_cell.alignment = value_alignment
+    for label, value in rows:
+        ws.append([styled(label, label_font), styled(value, alignment=value_alignment)])
 
-    ws.column_dimensions['A'].width = 22
-    ws.column_dimensions['B'].width = 40
+
+def iter_org_chart_rows(
+    root: Optional[Dict[str, Any]],
+    extractors: Sequence[Tuple[Optional[str], Optional[Callable[[Any], Any]]]],
+    skip_node: Callable[[Dict[str, Any]], bool],
+) -> Iterator[List[Any]]:
+    """Yield one export row per kept node of an org chart tree, in chart order.
+
+    ``extractors`` holds ``(node key, transform)`` pairs; a ``None`` key emits
+    the nearest kept manager's name.  Nodes for which ``skip_node`` returns
+    True are left out and pass their manager through to their children.
+    """
+    stack = [(root, "")]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node, manager_name = pop()
+        if not node:
+            continue
+
+        if skip_node(node):
+            current_manager = manager_name
+        else:
+            get = node.get
+            yield [
+                manager_name if node_key is None
+                else get(node_key, '') if transform is None
+                else transform(get(node_key, ''))
+                for node_key, transform in extractors
+            ]
+            current_manager = get('name', '')
+
+        children = node.get('children')
+        if children:
+            extend((child, current_manager) for child in reversed(children))
 
 
 def format_export_filters(scope, toggles=None, tp=None):
@@ -149,4 +198,5 @@ __all__ = [
     'format_hire_date',
     'add_metadata_sheet',
     'format_export_filters',
+    'iter_org_chart_rows',
 ]
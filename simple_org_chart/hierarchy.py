@@ -5,6 +5,8 @@ from __future__ import annotations
 import json
 import logging
 import os
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import simple_org_chart.config as app_config
@@ -21,14 +23,44 @@ def build_org_hierarchy(
     *,
     top_user_email_override: Optional[str] = None,
     settings: Optional[Dict[str, Any]] = None,
-) -> Optional[Dict[str, Any]]:
-    """Build an org chart hierarchy from a flat list of employees."""
+    return_missing: bool = False,
+    email_index: Optional[Dict[str, Dict[str, Any]]] = None,
+):
+    """Build an org chart hierarchy from a flat list of employees.
+
+    With ``return_missing=True`` a ``(hierarchy, missing_records)`` tuple is
+    returned, reusing the id index and settings resolved for the build
+    instead of rebuilding them in :func:`collect_missing_manager_records`.
+    Callers that already hold an email -> employee mapping can pass it as
+    ``email_index`` so the top-level user is found without another scan.
+    """
     if not employees:
-        return None
+        return (None, []) if return_missing else None
 
     if settings is None:
         settings = load_settings()
 
+    root, emp_dict = _link_org_hierarchy(
+        employees, top_user_email_override, settings, email_index,
+    )
+    if not return_missing:
+        return root
+
+    return root, _collect_missing_manager_records(
+        employees,
+        emp_dict,
+        root,
+        _missing_manager_exempt_email(settings, top_user_email_override),
+    )
+
+
+def _link_org_hierarchy(
+    employees: List[Dict[str, Any]],
+    top_user_email_override: Optional[str],
+    settings: Dict[str, Any],
+    email_index: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> tuple:
+    """Wire employee copies into a tree; return ``(root, copies_by_id)``."""
     # Read from settings (topLevelUserEmail / topLevelUserId)
     settings_top_user_email = (settings.get('topLevelUserEmail') or '').strip()
     settings_top_user_id = (settings.get('topLevelUserId') or '').strip()
@@ -57,7 +89,12 @@ def build_org_hierarchy(
     root = None
     if top_user_email:
         logger.info(f"Searching for user with email: '{top_user_email}' among {len(employees)} employees")
-        for emp in employees:
+        if email_index is not None:
+            match = email_index.get(top_user_email)
+            candidates = (match,) if match is not None else ()
+        else:
+            candidates = employees
+        for emp in candidates:
             if emp.get('email') == top_user_email:
                 root = emp_dict[emp['id']]
                 logger.info("Found and using configured top-level user for requested email filter")
@@ -90,7 +127,7 @@ def build_org_hierarchy(
         for emp_id, emp in emp_dict.items():
             emp['children'] = [child for child in emp['children'] if child['id'] != root['id']]
 
-        return root
+        return root, emp_dict
     else:
         # Auto-detect root using existing logic
         root_candidates = []
@@ -142,7 +179,19 @@ def build_org_hierarchy(
             root = emp_dict[employees[0]['id']]
             logger.info("Using first employee in list as root (no explicit or inferred top-level user found)")
 
-        return root
+        return root, emp_dict
+
+
+def _missing_manager_exempt_email(
+    settings: Optional[Dict[str, Any]],
+    top_user_email_override: Optional[str],
+) -> Optional[str]:
+    """Return the lower-cased top-level email that is never reported as missing a manager."""
+    if top_user_email_override is not None:
+        return (top_user_email_override or '').strip().lower() or None
+    if settings:
+        return (settings.get('topLevelUserEmail') or '').strip().lower() or None
+    return None
 
 
 def collect_missing_manager_records(
@@ -155,34 +204,39 @@ def collect_missing_manager_records(
     if not employees:
         return []
 
+    if settings is None:
+        settings = load_settings()
+
     employee_index = {emp['id']: emp for emp in employees if emp.get('id')}
-    visited = set()
+    return _collect_missing_manager_records(
+        employees,
+        employee_index,
+        hierarchy_root,
+        _missing_manager_exempt_email(settings, top_user_email_override),
+    )
+
 
-    def traverse(node):
+def _collect_missing_manager_records(
+    employees: List[Dict[str, Any]],
+    employee_index: Dict[str, Dict[str, Any]],
+    hierarchy_root: Optional[Dict[str, Any]],
+    top_user_email: Optional[str],
+) -> List[Dict[str, Any]]:
+    """Report employees unreachable from ``hierarchy_root`` or lacking a known manager."""
+    visited = set()
+    stack = [hierarchy_root] if hierarchy_root else []
+    while stack:
+        node = stack.pop()
         node_id = node.get('id')
         if not node_id or node_id in visited:
-            return
+            continue
         visited.add(node_id)
-        for child in node.get('children', []):
-            traverse(child)
-
-    if hierarchy_root:
-        traverse(hierarchy_root)
+        stack.extend(node.get('children', []))
 
     root_ids = set()
-    top_user_email = None
-
     if hierarchy_root and hierarchy_root.get('id'):
         root_ids.add(hierarchy_root['id'])
 
-    if settings is None:
-        settings = load_settings()
-
-    if top_user_email_override is not None:
-        top_user_email = (top_user_email_override or '').strip().lower() or None
-    elif settings:
-        top_user_email = (settings.get('topLevelUserEmail') or '').strip().lower() or None
-
     missing_records = []
 
     for emp in employees:
@@ -257,20 +311,21 @@ def load_cached_employees() -> Optional[List[Dict[str, Any]]]:
 def flatten_hierarchy_to_employee_list(root_node: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Walk a hierarchy tree and return a flat list of employees."""
     employees = []
+    # Explicit stack (children pushed in reverse) keeps pre-order without
+    # recursion, so very deep charts cannot hit the recursion limit.
+    stack = [root_node] if root_node else []
 
-    def _walk(node):
+    while stack:
+        node = stack.pop()
         if not isinstance(node, dict):
-            return
+            continue
 
         entry = {k: v for k, v in node.items() if k != 'children'}
         entry['children'] = []
         employees.append(entry)
 
-        for child in node.get('children', []) or []:
-            _walk(child)
-
-    if root_node:
-        _walk(root_node)
+        children = node.get('children', []) or []
+        stack.extend(reversed(children))
 
     return employees
 
@@ -340,6 +395,51 @@ def collect_employee_option_labels(
     return sorted(options.values(), key=lambda item: item.lower())
 
 
+@lru_cache(maxsize=4096)
+def _hire_date_epoch(hire_value: str) -> Optional[float]:
+    """Parse an ISO ``hireDate`` to epoch seconds; naive values are local time."""
+    try:
+        return datetime.fromisoformat(hire_value).timestamp()
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def mark_new_employees(
+    root_node: Optional[Dict[str, Any]],
+    months_threshold: int,
+    *,
+    now: Optional[datetime] = None,
+) -> None:
+    """Set ``isNewEmployee`` on every node hired within ``months_threshold`` months.
+
+    Hire dates are reduced to epoch seconds, memoised across calls, so each
+    node costs a cache lookup and one float comparison against the cutoff.
+    ``now`` must be timezone-aware when given.
+    """
+    if not root_node:
+        return
+
+    now_epoch = (now or datetime.now(timezone.utc)).timestamp()
+    cutoff_epoch = now_epoch - timedelta(days=months_threshold * 30).total_seconds()
+
+    stack = [root_node]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+
+        hire_value = node.get('hireDate')
+        if hire_value and isinstance(hire_value, str):
+            hire_epoch = _hire_date_epoch(hire_value)
+            node['isNewEmployee'] = hire_epoch is not None and hire_epoch > cutoff_epoch
+        else:
+            node['isNewEmployee'] = False
+
+        children = node.get('children')
+        if children:
+            stack.extend(children)
+
+
 __all__ = [
     'build_org_hierarchy',
     'collect_missing_manager_records',
@@ -348,4 +448,5 @@ __all__ = [
     'get_employee_list_for_metadata',
     'collect_unique_field_values',
     'collect_employee_option_labels',
+    'mark_new_employees',
 ]
@@ -6,7 +6,8 @@ import json
 import logging
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Iterable, List, Optional, Sequence, Type
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
 
 import simple_org_chart.config as app_config
 from simple_org_chart.msgraph import parse_graph_datetime
@@ -28,10 +29,16 @@ MISSING_HIRE_DATE_FILE = str(app_config.MISSING_HIRE_DATE_FILE)
 
 
 class ReportCacheManager:
-    """Centralised helper for loading cached report data."""
+    """Centralised helper for loading cached report data.
+
+    Parsed payloads are kept per path and reused while the file's
+    ``(st_mtime_ns, st_size)`` is unchanged, so callers must treat the
+    returned data as read-only.
+    """
 
     def __init__(self, refresh_callback: Optional[Callable[[], None]] = None) -> None:
         self._refresh_callback = refresh_callback
+        self._parsed: Dict[str, Tuple[Tuple[int, int], Any]] = {}
 
     def load_json(
         self,
@@ -57,24 +64,40 @@ class ReportCacheManager:
             else:
                 logger.warning("No refresh callback configured; cannot refresh %s", description)
 
-        if not os.path.exists(path):
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            self._parsed.pop(path, None)
             logger.warning("%s not found at %s", description, path)
             return [] if expected_type is list else None
 
+        signature = (stat_result.st_mtime_ns, stat_result.st_size)
+        cached = self._parsed.get(path)
+        if cached is not None and cached[0] == signature:
+            data = cached[1]
+        else:
+            data = self._parse(path, signature, description)
+            if data is None:
+                return [] if expected_type is list else None
+
+        if expected_type is not None and not isinstance(data, expected_type):
+            logger.warning("Unexpected payload type for %s; expected %s", description, expected_type.__name__)
+            return [] if expected_type is list else None
+
+        return data
+
+    def _parse(self, path: str, signature: Tuple[int, int], description: str):
         try:
             with open(path, "r", encoding="utf-8") as handle:
                 data = json.load(handle)
         except json.JSONDecodeError as decode_error:
             logger.error("Failed to parse %s at %s: %s", description, path, decode_error)
-            return [] if expected_type is list else None
+            return None
         except Exception as error:  # pragma: no cover - I/O errors
             logger.error("Unexpected error loading %s at %s: %s", description, path, error)
-            return [] if expected_type is list else None
-
-        if expected_type is not None and not isinstance(data, expected_type):
-            logger.warning("Unexpected payload type for %s; expected %s", description, expected_type.__name__)
-            return [] if expected_type is list else None
+            return None
 
+        self._parsed[path] = (signature, data)
         return data
 
 
@@ -158,6 +181,19 @@ def load_filtered_user_data(cache: ReportCacheManager, *, force_refresh: bool =
     )
 
 
+@lru_cache(maxsize=8192)
+def _parse_cached_timestamp_text(value: str) -> Optional[datetime]:
+    return parse_graph_datetime(value)
+
+
+def _parse_report_timestamp(value: object) -> Optional[datetime]:
+    # Cached report files carry the same timestamp strings on every request,
+    # so the recent-days window reuses their parsed datetimes.
+    if isinstance(value, str):
+        return _parse_cached_timestamp_text(value)
+    return parse_graph_datetime(value)
+
+
 def apply_disabled_filters(
     records: Optional[Sequence[dict]],
     *,
@@ -187,7 +223,7 @@ def apply_disabled_filters(
             continue
 
         if cutoff is not None:
-            observed = parse_graph_datetime(
+            observed = _parse_report_timestamp(
                 record.get("firstSeenDisabledAt")
                 or record.get("disabledDate")
             )
@@ -203,39 +239,35 @@ def calculate_license_totals(records: Optional[Iterable[dict]]):
     return sum((record.get("licenseCount") or 0) for record in records or [])
 
 
-def _resolve_mailbox_categories(record: dict) -> tuple[bool, bool, bool]:
-    mailbox_type_raw = record.get("mailboxType")
-    mailbox_type_value = str(mailbox_type_raw).strip().lower() if mailbox_type_raw is not None else ""
+_FALSE_FLAG_VALUES = frozenset({"false", "0", "no", "off"})
 
-    shared_flag = record.get("isSharedMailbox")
-    if isinstance(shared_flag, str):
-        lowered_flag = shared_flag.strip().lower()
-        if lowered_flag in {"true", "1", "yes", "on"}:
-            shared_flag = True
-        elif lowered_flag in {"false", "0", "no", "off"}:
-            shared_flag = False
-
-    is_shared_mailbox = False
-    if isinstance(shared_flag, bool):
-        is_shared_mailbox = shared_flag
-    elif shared_flag:
-        is_shared_mailbox = True
 
+@lru_cache(maxsize=128)
+def _classify_mailbox(mailbox_type_value: str, is_shared_mailbox: bool) -> tuple[bool, bool, bool]:
     if not is_shared_mailbox and mailbox_type_value.startswith("shared"):
         is_shared_mailbox = True
 
-    is_room_equipment_mailbox = False
-    if not is_shared_mailbox and mailbox_type_value:
-        if mailbox_type_value in {"room", "equipment"}:
-            is_room_equipment_mailbox = True
-        elif any(mailbox_type_value.startswith(prefix) for prefix in ("room", "equipment")):
-            is_room_equipment_mailbox = True
-
+    is_room_equipment_mailbox = (
+        not is_shared_mailbox and mailbox_type_value.startswith(("room", "equipment"))
+    )
     is_user_mailbox = not is_shared_mailbox and not is_room_equipment_mailbox
 
     return is_user_mailbox, is_shared_mailbox, is_room_equipment_mailbox
 
 
+def _resolve_mailbox_categories(record: dict) -> tuple[bool, bool, bool]:
+    mailbox_type_raw = record.get("mailboxType")
+    mailbox_type_value = str(mailbox_type_raw).strip().lower() if mailbox_type_raw is not None else ""
+
+    shared_flag = record.get("isSharedMailbox")
+    if isinstance(shared_flag, str):
+        is_shared_mailbox = bool(shared_flag) and shared_flag.strip().lower() not in _FALSE_FLAG_VALUES
+    else:
+        is_shared_mailbox = bool(shared_flag)
+
+    return _classify_mailbox(mailbox_type_value, is_shared_mailbox)
+
+
 def apply_last_login_filters(
     records: Optional[Sequence[dict]],
     *,
@@ -280,6 +312,23 @@ def apply_last_login_filters(
         except (TypeError, ValueError):
             inactive_max_threshold = None
 
+    if (
+        not require_never_signed_in
+        and inactive_threshold is None
+        and inactive_max_threshold is None
+        and all((
+            include_user_mailboxes, include_shared_mailboxes, include_room_equipment_mailboxes,
+            include_enabled, include_disabled, include_licensed, include_unlicensed,
+            include_members, include_guests, include_never_signed_in,
+            include_hidden_from_address_list, include_visible_in_address_list,
+            include_with_mailbox, include_without_mailbox,
+            include_with_manager, include_without_manager,
+        ))
+    ):
+        # Nothing can be excluded (the report's default view): skip the per-record sweep.
+        return list(records)
+
+    has_days_window = inactive_threshold is not None or inactive_max_threshold is not None
     filtered: List[dict] = []
 
     for record in records:
@@ -317,14 +366,13 @@ def apply_last_login_filters(
         if require_never_signed_in and not never_signed_in:
             continue
 
-        if inactive_threshold is not None:
+        if has_days_window:
             days_since = record.get("daysSinceLastActivity")
-            if days_since is None or days_since < inactive_threshold:
+            if days_since is None:
                 continue
-
-        if inactive_max_threshold is not None:
-            days_since = record.get("daysSinceLastActivity")
-            if days_since is None or days_since > inactive_max_threshold:
+            if inactive_threshold is not None and days_since < inactive_threshold:
+                continue
+            if inactive_max_threshold is not None and days_since > inactive_max_threshold:
                 continue
 
         # A shared/room/equipment mailbox is a mailbox by definition.
@@ -381,6 +429,17 @@ def apply_filtered_user_filters(
     if not records:
         return []
 
+    if all((
+        include_user_mailboxes, include_shared_mailboxes, include_room_equipment_mailboxes,
+        include_enabled, include_disabled, include_licensed, include_unlicensed,
+        include_members, include_guests,
+        include_hidden_from_address_list, include_visible_in_address_list,
+        include_with_mailbox, include_without_mailbox,
+        include_with_manager, include_without_manager,
+    )):
+        # Every toggle admits everything: skip the per-record sweep.
+        return list(records)
+
     filtered: List[dict] = []
 
     for record in records:
@@ -9,6 +9,7 @@ import os
 import re
 import tempfile
 import threading
+from functools import lru_cache
 from typing import Any, Callable, Dict, Iterable, Set, Union
 
 from .config import SETTINGS_FILE
@@ -179,6 +180,7 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 
 _filter_legacy_split_re = re.compile(r"\s*[;,]+\s*")
 _trim_edge_punct = re.compile(r"^[\s\-–—|]+|[\s\-–—|]+$")
+_whitespace_run = re.compile(r"\s+")
 _hex_six_pattern = re.compile(r"^[0-9a-fA-F]{6}$")
 
 
@@ -221,35 +223,63 @@ def _apply_environment_overrides(settings: Dict[str, Any]) -> Dict[str, Any]:
     return settings.copy()
 
 
+# Last merged settings keyed by (path, mtime_ns, size) so unchanged files are
+# not re-read and re-normalised on every request.
+_settings_cache: tuple[tuple[str, int, int], Dict[str, Any]] | None = None
+
+
+def _invalidate_settings_cache() -> None:
+    global _settings_cache
+    _settings_cache = None
+
+
+def _copy_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy settings deep enough that callers cannot mutate cached containers."""
+    return {
+        key: value.copy() if isinstance(value, (dict, list)) else value
+        for key, value in settings.items()
+    }
+
+
 def load_settings() -> Dict[str, Any]:
     """Load persisted settings or fall back to defaults."""
-    if SETTINGS_FILE.exists():
-        try:
-            with SETTINGS_FILE.open("r", encoding="utf-8") as handle:
-                stored = json.load(handle)
-        except Exception as error:  # noqa: BLE001 - log and fall back
-            logger.error("Error loading settings: %s", error)
-        else:
-            merged = DEFAULT_SETTINGS.copy()
-            merged.update(stored)
-            merged.pop("highlightNewEmployees", None)
-            merged["headerColor"] = _normalize_hex_color(
-                merged.get("headerColor"),
-                DEFAULT_SETTINGS["headerColor"],
-            )
+    global _settings_cache
+    try:
+        stat = SETTINGS_FILE.stat()
+    except OSError:
+        return _apply_environment_overrides(DEFAULT_SETTINGS)
 
-            default_node_colors = DEFAULT_SETTINGS["nodeColors"].copy()
-            stored_node_colors = stored.get("nodeColors")
-            if isinstance(stored_node_colors, dict):
-                default_node_colors.update(stored_node_colors)
+    cache_key = (str(SETTINGS_FILE), stat.st_mtime_ns, stat.st_size)
+    cached = _settings_cache
+    if cached is not None and cached[0] == cache_key:
+        return _apply_environment_overrides(_copy_settings(cached[1]))
 
-            merged["nodeColors"] = {
-                level: _normalize_hex_color(color, DEFAULT_SETTINGS["nodeColors"].get(level, "#000000"))
-                for level, color in default_node_colors.items()
-            }
-            return _apply_environment_overrides(merged)
+    try:
+        with SETTINGS_FILE.open("r", encoding="utf-8") as handle:
+            stored = json.load(handle)
+    except Exception as error:  # noqa: BLE001 - log and fall back
+        logger.error("Error loading settings: %s", error)
+        return _apply_environment_overrides(DEFAULT_SETTINGS)
+
+    merged = DEFAULT_SETTINGS.copy()
+    merged.update(stored)
+    merged.pop("highlightNewEmployees", None)
+    merged["headerColor"] = _normalize_hex_color(
+        merged.get("headerColor"),
+        DEFAULT_SETTINGS["headerColor"],
+    )
 
-    return _apply_environment_overrides(DEFAULT_SETTINGS)
+    default_node_colors = DEFAULT_SETTINGS["nodeColors"].copy()
+    stored_node_colors = stored.get("nodeColors")
+    if isinstance(stored_node_colors, dict):
+        default_node_colors.update(stored_node_colors)
+
+    merged["nodeColors"] = {
+        level: _normalize_hex_color(color, DEFAULT_SETTINGS["nodeColors"].get(level, "#000000"))
+        for level, color in default_node_colors.items()
+    }
+    _settings_cache = (cache_key, _copy_settings(merged))
+    return _apply_environment_overrides(merged)
 
 
 def save_settings(settings: Dict[str, Any]) -> bool:
@@ -277,6 +307,15 @@ def save_settings(settings: Dict[str, Any]) -> bool:
     }
 
     logger.info("Attempting to save settings to: %s", SETTINGS_FILE)
+    if not _merge_into_settings_file(persisted):
+        return False
+
+    logger.info("Settings saved successfully. File exists: %s", SETTINGS_FILE.exists())
+    return True
+
+
+def _merge_into_settings_file(updates: Dict[str, Any]) -> bool:
+    """Merge ``updates`` into SETTINGS_FILE under the settings lock."""
     try:
         with _settings_file_lock:
             # Read the current file so we keep all other keys intact
@@ -302,7 +341,7 @@ def save_settings(settings: Dict[str, Any]) -> bool:
                         if not backup_path.exists():
                             os.replace(SETTINGS_FILE, backup_path)
 
-            existing.update(persisted)
+            existing.update(updates)
 
             # Atomic write: write to a temp file then replace
             tmp_fd, tmp_path = tempfile.mkstemp(
@@ -316,20 +355,38 @@ def save_settings(settings: Dict[str, Any]) -> bool:
                 with contextlib.suppress(OSError):
                     os.unlink(tmp_path)
                 raise
+            finally:
+                _invalidate_settings_cache()
     except Exception as error:  # noqa: BLE001 - mirror legacy behaviour
         logger.error("Error saving settings to %s: %s", SETTINGS_FILE, error)
         return False
-
-    logger.info("Settings saved successfully. File exists: %s", SETTINGS_FILE.exists())
     return True
 
 
+def update_settings(updates: Dict[str, Any]) -> bool:
+    """Persist only ``updates`` on top of the stored settings.
+
+    Single-key endpoints use this instead of ``load_settings`` +
+    ``save_settings`` so the read-modify-write happens once, under the file
+    lock, and concurrent toggles of different keys cannot overwrite each other.
+    """
+    SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    return _merge_into_settings_file(dict(updates))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_filter_text(text: str) -> str:
+    # Department, title and contact strings repeat across thousands of
+    # employees, so the two regex passes are memoised per distinct value.
+    cleaned = _trim_edge_punct.sub("", text)
+    cleaned = _whitespace_run.sub(" ", cleaned)
+    return cleaned.strip().lower()
+
+
 def normalize_filter_value(value: Any) -> str:
     if not value:
         return ""
-    cleaned = _trim_edge_punct.sub("", str(value))
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return cleaned.strip().lower()
+    return _normalize_filter_text(str(value))
 
 
 def parse_filter_values(raw_value: Any) -> Set[str]:
@@ -428,5 +485,6 @@ __all__ = [
     "parse_ignored_employees",
     "parse_ignored_titles",
     "save_settings",
+    "update_settings",
     "translate_placeholder",
 ]
@@ -578,31 +578,45 @@ def generate_xlsx(scan_result: Dict[str, Any]) -> Path:
     Returns the path to the generated file.
     """
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment
 
-    wb = Workbook()
+    # Streaming workbook: rows are flushed as they are appended, so column
+    # widths have to be set before a sheet's first row.
+    wb = Workbook(write_only=True)
 
-    # --- Summary sheet ---
-    ws_summary = wb.active
-    ws_summary.title = 'Summary'
     header_font = Font(bold=True, color='FFFFFF')
     header_fill = PatternFill(start_color='0078D4', end_color='0078D4', fill_type='solid')
+    header_alignment = Alignment(horizontal='center')
+
+    def start_sheet(title, headers):
+        ws = wb.create_sheet(title=title)
+        for col in range(1, len(headers) + 1):
+            ws.column_dimensions[chr(64 + col)].width = 28
+        header_cells = []
+        for h in headers:
+            cell = WriteOnlyCell(ws, value=h)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            header_cells.append(cell)
+        ws.append(header_cells)
+        return ws
 
+    # --- Summary sheet ---
     summary_headers = ['Name', 'Email', 'Sites Checked', 'Registered', 'Error']
-    for col, h in enumerate(summary_headers, 1):
-        cell = ws_summary.cell(row=1, column=col, value=h)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center')
+    ws_summary = start_sheet('Summary', summary_headers)
 
     site_data: Dict[str, List[Dict[str, str]]] = {}
 
-    for idx, rec in enumerate(scan_result.get('records', []), start=2):
-        ws_summary.cell(row=idx, column=1, value=rec.get('name', ''))
-        ws_summary.cell(row=idx, column=2, value=rec.get('email', ''))
-        ws_summary.cell(row=idx, column=3, value=rec.get('totalChecked', 0))
-        ws_summary.cell(row=idx, column=4, value=rec.get('registeredCount', 0))
-        ws_summary.cell(row=idx, column=5, value=rec.get('error', ''))
+    for rec in scan_result.get('records', []):
+        ws_summary.append([
+            rec.get('name', ''),
+            rec.get('email', ''),
+            rec.get('totalChecked', 0),
+            rec.get('registeredCount', 0),
+            rec.get('error', ''),
+        ])
 
         for r in rec.get('results', []):
             site = r.get('site_name') or 'Unknown'
@@ -617,9 +631,6 @@ def generate_xlsx(scan_result: Dict[str, Any]) -> Path:
                     'reason': r.get('reason', ''),
                 })
 
-    for col in range(1, len(summary_headers) + 1):
-        ws_summary.column_dimensions[chr(64 + col)].width = 28
-
     # --- Per-site sheets ---
     site_headers = ['Name', 'Email', 'Category', 'Status', 'URL', 'Reason']
     for site_name in sorted(site_data.keys(), key=lambda s: s.lower()):
@@ -631,23 +642,16 @@ def generate_xlsx(scan_result: Dict[str, Any]) -> Path:
             sheet_title = f'{orig_title[:28]}_{suffix}'
             suffix += 1
 
-        ws = wb.create_sheet(title=sheet_title)
-        for col, h in enumerate(site_headers, 1):
-            cell = ws.cell(row=1, column=col, value=h)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center')
-
-        for row_idx, entry in enumerate(site_data[site_name], start=2):
-            ws.cell(row=row_idx, column=1, value=entry['name'])
-            ws.cell(row=row_idx, column=2, value=entry['email'])
-            ws.cell(row=row_idx, column=3, value=entry['category'])
-            ws.cell(row=row_idx, column=4, value=entry['status'])
-            ws.cell(row=row_idx, column=5, value=entry['url'])
-            ws.cell(row=row_idx, column=6, value=entry['reason'])
-
-        for col in range(1, len(site_headers) + 1):
-            ws.column_dimensions[chr(64 + col)].width = 28
+        ws = start_sheet(sheet_title, site_headers)
+        for entry in site_data[site_name]:
+            ws.append([
+                entry['name'],
+                entry['email'],
+                entry['category'],
+                entry['status'],
+                entry['url'],
+                entry['reason'],
+            ])
 
     # Save
     scan_id = str(uuid.uuid4())[:8]
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import contextlib
+import json
 import logging
+import os
+import secrets
+import tempfile
 
 try:
     from PIL import Image  # type: ignore
@@ -34,4 +39,54 @@ def validate_image_file(file_obj) -> bool:
         return False
 
 
-__all__ = ["validate_image_file"]
+def create_temp_file(directory, *, prefix="", suffix=""):
+    """Create a new, uniquely named file in ``directory`` and return ``(fd, path)``.
+
+    Unlike ``tempfile.mkstemp``, which always creates 0600 files, the file
+    is opened with mode 0666 so the kernel applies the process umask, as a
+    plain ``open()`` would. Files moved into place from here stay readable
+    by other users that serve DATA_DIR.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(tempfile.TMP_MAX):
+        path = os.path.join(directory, f"{prefix}{secrets.token_hex(8)}{suffix}")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No usable temporary file name found in {directory}")
+
+
+@contextlib.contextmanager
+def _atomic_target(path, mode):
+    """Yield a handle on a sibling temp file that replaces ``path`` on success."""
+    directory, name = os.path.split(os.fspath(path))
+    fd, tmp_path = create_temp_file(directory or os.curdir, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as handle:
+            yield handle
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_json_atomic(path, payload, *, indent=None) -> None:
+    """Serialize ``payload`` to ``path`` via a sibling temp file and ``os.replace``.
+
+    Readers never observe a partially written document. The document is
+    encoded with one ``json.dumps`` call, which takes the C encoder when
+    ``indent`` is None (``json.dump`` always uses the pure-Python one).
+    """
+    with _atomic_target(path, "w") as handle:
+        handle.write(json.dumps(payload, indent=indent))
+
+
+def write_bytes_atomic(path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a sibling temp file and ``os.replace``."""
+    with _atomic_target(path, "wb") as handle:
+        handle.write(data)
+
+
+__all__ = ["create_temp_file", "validate_image_file", "write_bytes_atomic", "write_json_atomic"]
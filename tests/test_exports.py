@@ -4,7 +4,21 @@ from __future__ import annotations
 
 import pytest
 from openpyxl import Workbook
-from simple_org_chart.exports import add_metadata_sheet, format_export_filters
+from simple_org_chart.exports import (
+    add_metadata_sheet,
+    format_export_filters,
+    format_hire_date,
+    iter_org_chart_rows,
+)
+
+
+class TestFormatHireDate:
+    def test_iso_timestamp(self):
+        assert format_hire_date('2024-03-05T08:00:00Z') == '2024-03-05'
+
+    def test_empty_and_unparseable(self):
+        assert format_hire_date(None) == ''
+        assert format_hire_date('soon') == 'soon'
 
 
 class TestFormatExportFilters:
@@ -130,3 +144,26 @@ class TestAddMetadataSheet:
             for row in range(4, metadata_ws.max_row + 1)
         }
         assert rows.get('Exported by') == 'alice@example.com'
+
+
+class TestIterOrgChartRows:
+    def test_chart_order_and_skipped_manager_passthrough(self):
+        tree = {
+            'name': 'Root', 'children': [
+                {'name': 'Hidden', 'skip': True, 'children': [{'name': 'Leaf'}]},
+                {'name': 'Second', 'hireDate': 'x'},
+            ],
+        }
+        rows = list(iter_org_chart_rows(
+            tree,
+            [('name', None), (None, None), ('hireDate', str.upper)],
+            lambda node: node.get('skip', False),
+        ))
+        assert rows == [
+            ['Root', '', ''],
+            ['Leaf', 'Root', ''],
+            ['Second', 'Root', 'X'],
+        ]
+
+    def test_empty_root(self):
+        assert list(iter_org_chart_rows(None, [('name', None)], lambda node: False)) == []
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Any, Dict, List
 
 import pytest
@@ -9,6 +10,7 @@ from simple_org_chart.hierarchy import (
     build_org_hierarchy,
     collect_missing_manager_records,
     flatten_hierarchy_to_employee_list,
+    mark_new_employees,
 )
 from simple_org_chart.settings import DEFAULT_SETTINGS
 
@@ -42,6 +44,17 @@ class TestBuildOrgHierarchy:
         assert root is not None
         assert root["name"] == "Bob VP"
 
+    def test_explicit_top_user_with_email_index(self, sample_employees):
+        by_email = {emp["email"]: emp for emp in sample_employees if emp.get("email")}
+        root = build_org_hierarchy(
+            sample_employees,
+            top_user_email_override="bob@example.com",
+            settings=_settings(),
+            email_index=by_email,
+        )
+        assert root is not None
+        assert root["name"] == "Bob VP"
+
     def test_children_wired(self, sample_employees):
         root = build_org_hierarchy(sample_employees, settings=_settings())
         child_names = {c["name"] for c in root.get("children", [])}
@@ -81,6 +94,20 @@ class TestFlattenHierarchy:
     def test_flatten_none(self):
         assert flatten_hierarchy_to_employee_list(None) == []
 
+    def test_flatten_preorder_and_deep_chain(self):
+        root = {"id": "a", "children": [
+            {"id": "b", "children": [{"id": "c", "children": []}]},
+            {"id": "d", "children": []},
+        ]}
+        assert [e["id"] for e in flatten_hierarchy_to_employee_list(root)] == ["a", "b", "c", "d"]
+
+        deep = node = {"id": "0", "children": []}
+        for index in range(1, 5000):
+            child = {"id": str(index), "children": []}
+            node["children"].append(child)
+            node = child
+        assert len(flatten_hierarchy_to_employee_list(deep)) == 5000
+
 
 # ---------------------------------------------------------------------------
 # collect_missing_manager_records
@@ -110,3 +137,48 @@ class TestMissingManagers:
 
     def test_empty_input(self):
         assert collect_missing_manager_records([]) == []
+
+    def test_returned_with_hierarchy(self, sample_employees):
+        root, missing = build_org_hierarchy(
+            sample_employees,
+            settings=_settings(),
+            return_missing=True,
+        )
+        assert root["name"] == "Alice CEO"
+        assert missing == collect_missing_manager_records(
+            sample_employees,
+            hierarchy_root=root,
+            settings=_settings(),
+        )
+
+
+# ---------------------------------------------------------------------------
+# mark_new_employees
+# ---------------------------------------------------------------------------
+
+
+class TestMarkNewEmployees:
+    NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+    def test_marks_recent_hires_across_tree(self):
+        root = {
+            "name": "Root",
+            "hireDate": "2020-01-01T00:00:00+00:00",
+            "children": [
+                {"name": "New", "hireDate": "2025-05-01T00:00:00+00:00", "children": [
+                    {"name": "Also New", "hireDate": "2025-05-01T00:00:00+00:00", "children": []},
+                ]},
+                {"name": "No Date", "hireDate": None, "children": []},
+            ],
+        }
+        mark_new_employees(root, 3, now=self.NOW)
+        flat = {n["name"]: n["isNewEmployee"] for n in flatten_hierarchy_to_employee_list(root)}
+        assert flat == {"Root": False, "New": True, "Also New": True, "No Date": False}
+
+    def test_invalid_date_is_not_new(self):
+        root = {"name": "Bad", "hireDate": "not-a-date", "children": []}
+        mark_new_employees(root, 3, now=self.NOW)
+        assert root["isNewEmployee"] is False
+
+    def test_none_root(self):
+        mark_new_employees(None, 3)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List
 from unittest.mock import patch
@@ -58,6 +59,17 @@ class TestReportCacheManager:
         result = cache.load_json(str(file_path), description="test", expected_type=list)
         assert result == []
 
+    def test_parsed_payload_reused_until_file_changes(self, tmp_path: Path):
+        file_path = tmp_path / "data.json"
+        file_path.write_text(json.dumps([{"id": 1}]), encoding="utf-8")
+
+        cache = ReportCacheManager()
+        first = cache.load_json(str(file_path), description="test")
+        assert cache.load_json(str(file_path), description="test") is first
+
+        file_path.write_text(json.dumps([{"id": 1}, {"id": 2}]), encoding="utf-8")
+        assert len(cache.load_json(str(file_path), description="test")) == 2
+
     def test_refresh_callback_invoked(self, tmp_path: Path):
         data = [{"id": 1}]
         file_path = tmp_path / "data.json"
@@ -134,6 +146,20 @@ class TestApplyLastLoginFilters:
         for r in result:
             assert r.get("mailboxType") != "room"
 
+    def test_shared_mailbox_string_flags(self):
+        records = [
+            {"name": "FlagYes", "isSharedMailbox": "Yes", "mailboxType": "user"},
+            {"name": "FlagOff", "isSharedMailbox": "off", "mailboxType": "user"},
+            {"name": "TypeShared", "mailboxType": "SharedMailbox"},
+            {"name": "Equipment", "mailboxType": "EquipmentMailbox"},
+        ]
+        result = apply_last_login_filters(
+            records,
+            include_shared_mailboxes=False,
+            include_room_equipment_mailboxes=False,
+        )
+        assert [r["name"] for r in result] == ["FlagOff"]
+
     def test_inactive_days_threshold(self, sample_login_records):
         result = apply_last_login_filters(
             sample_login_records,
@@ -239,6 +265,11 @@ class TestApplyLastLoginFilters:
         result = apply_last_login_filters(records, include_without_manager=False)
         assert [r["name"] for r in result] == ["Managed"]
 
+    def test_all_toggles_on_returns_every_record(self, sample_login_records):
+        result = apply_last_login_filters(sample_login_records)
+        assert result == list(sample_login_records)
+        assert result is not sample_login_records
+
     def test_none_records(self):
         assert apply_last_login_filters(None) == []
 
@@ -361,3 +392,16 @@ class TestApplyDisabledFilters:
         result = apply_disabled_filters(records, include_guests=False)
         assert len(result) == 1
         assert result[0]["userType"] == "Member"
+
+    def test_recent_days_window(self):
+        now = datetime.now(timezone.utc)
+        records = [
+            {"name": "Recent", "userType": "Member",
+             "firstSeenDisabledAt": (now - timedelta(days=2)).isoformat()},
+            {"name": "Old", "userType": "Member",
+             "disabledDate": (now - timedelta(days=60)).isoformat()},
+            {"name": "Unknown", "userType": "Member"},
+        ]
+        for _ in range(2):
+            result = apply_disabled_filters(records, recent_days=30)
+            assert [r["name"] for r in result] == ["Recent"]
@@ -20,6 +20,7 @@ from simple_org_chart.settings import (
     parse_ignored_titles,
     save_settings,
     translate_placeholder,
+    update_settings,
 )
 
 
@@ -177,3 +178,31 @@ class TestSettingsPersistence:
             save_settings(custom)
             loaded = load_settings()
         assert loaded["headerColor"] == "#FF0000"
+
+    def test_cached_load_not_mutated_by_callers(self, tmp_path: Path):
+        fake_settings_file = tmp_path / "app_settings.json"
+        with patch("simple_org_chart.settings.SETTINGS_FILE", fake_settings_file):
+            save_settings({"chartTitle": "Cached"})
+            first = load_settings()
+            first["chartTitle"] = "Changed"
+            first["nodeColors"]["level0"] = "#000000"
+            second = load_settings()
+        assert second["chartTitle"] == "Cached"
+        assert second["nodeColors"]["level0"] != "#000000"
+
+    def test_update_settings_keeps_other_keys(self, tmp_path: Path):
+        fake_settings_file = tmp_path / "app_settings.json"
+        with patch("simple_org_chart.settings.SETTINGS_FILE", fake_settings_file):
+            save_settings({"chartTitle": "Kept"})
+            assert update_settings({"multiLineChildrenEnabled": True}) is True
+            loaded = load_settings()
+        assert loaded["chartTitle"] == "Kept"
+        assert loaded["multiLineChildrenEnabled"] is True
+
+    def test_reload_after_external_write(self, tmp_path: Path):
+        fake_settings_file = tmp_path / "app_settings.json"
+        fake_settings_file.write_text(json.dumps({"chartTitle": "One"}), encoding="utf-8")
+        with patch("simple_org_chart.settings.SETTINGS_FILE", fake_settings_file):
+            assert load_settings()["chartTitle"] == "One"
+            fake_settings_file.write_text(json.dumps({"chartTitle": "Second"}), encoding="utf-8")
+            assert load_settings()["chartTitle"] == "Second"